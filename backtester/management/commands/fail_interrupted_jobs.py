@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from backtester.tasks import fail_stale_backtests, fail_stale_strategies
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark strategy generations and backtest jobs left unfinished by a previous "
+        "server process as failed. Run it before starting the server, when no job "
+        "can be live."
+    )
+
+    def handle(self, *args, **options):
+        failed_strategies = fail_stale_strategies(older_than=None)
+        failed_backtests = fail_stale_backtests(older_than=None)
+        self.stdout.write(
+            f"Marked {failed_strategies} interrupted strategy generation(s) and "
+            f"{failed_backtests} backtest job(s) as failed."
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backtester', '0004_strategy_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='strategy',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='strategy',
+            name='error',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-15 11:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backtester', '0006_backtestjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='strategy',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
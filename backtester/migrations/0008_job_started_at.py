@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-15 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backtester', '0007_strategy_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backtestjob',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='strategy',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
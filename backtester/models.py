@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.db.models import JSONField
 from django.contrib.auth import get_user_model
@@ -6,10 +8,43 @@ User = get_user_model()
 
 
 class Strategy(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        READY = "ready"
+        FAILED = "failed"
+
     name = models.CharField(max_length=255)
     prompt = models.TextField()
     strategy_code = models.TextField()
     parameters = JSONField()
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.READY
+    )
+    error = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # When the pending generation began running, None while it is queued
+    started_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return f"Strategy for {self.user.username}"
+
+
+class BacktestJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        READY = "ready"
+        FAILED = "failed"
+
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    parameters = JSONField()
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    results = JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Backtest job {self.job_id} ({self.status})"
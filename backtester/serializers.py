@@ -1,11 +1,30 @@
+from datetime import date
+
+from django.db import transaction
 from rest_framework import serializers
-from backtester.models import Strategy
+from backtester.models import BacktestJob, Strategy
+
+
+class BulkCreateStrategySerializer(serializers.ListSerializer):
+    # Each strategy queues an LLM generation, so one request can't queue too many
+    MAX_STRATEGIES = 50
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", self.MAX_STRATEGIES)
+        super().__init__(*args, **kwargs)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            return Strategy.objects.bulk_create(
+                [Strategy(**attrs) for attrs in validated_data], batch_size=500
+            )
 
 
 class CreateStrategySerializer(serializers.ModelSerializer):
     class Meta:
         model = Strategy
         fields = ("name", "prompt")
+        list_serializer_class = BulkCreateStrategySerializer
 
     def create(self, validated_data):
         return Strategy.objects.create(**validated_data)
@@ -22,9 +41,61 @@ class ListStrategySerializer(serializers.ModelSerializer):
             "prompt",
             "strategy_code",
             "parameters",
+            "status",
+        )
+
+
+class StrategyStatusSerializer(serializers.ModelSerializer):
+    strategy_id = serializers.IntegerField(source="id", read_only=True)
+
+    class Meta:
+        model = Strategy
+        fields = (
+            "strategy_id",
+            "status",
+            "error",
+            "strategy_code",
+            "parameters",
+        )
+
+
+class BacktestJobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = BacktestJob
+        fields = (
+            "job_id",
+            "status",
+            "error",
+            "results",
         )
 
 
+class RunBacktestSerializer(serializers.Serializer):
+    strategy_code = serializers.CharField(
+        error_messages={
+            "required": "No strategy to backtest. Please provide a strategy.",
+            "blank": "No strategy to backtest. Please provide a strategy.",
+        },
+        trim_whitespace=False,
+    )
+    parameters = serializers.DictField(default=dict)
+    assets = serializers.ListField(child=serializers.CharField(), default=list)
+    start_date = serializers.DateField(default=date(2022, 1, 1))
+    end_date = serializers.DateField(default=date(2023, 1, 1))
+    initial_cash = serializers.FloatField(default=100000, min_value=0)
+    generate_plots = serializers.BooleanField(default=True)
+
+    def validate_assets(self, assets):
+        # Each asset is backtested once, in the order it was first given
+        return list(dict.fromkeys(asset.strip() for asset in assets if asset.strip()))
+
+    def validate(self, attrs):
+        if attrs["start_date"] > attrs["end_date"]:
+            raise serializers.ValidationError("start_date must not be after end_date.")
+        return attrs
+
+
 class UpdateStrategySerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -37,10 +108,11 @@ class UpdateStrategySerializer(serializers.ModelSerializer):
         )
 
     def update(self, instance, validated_data):
-        instance.prompt = validated_data.get("prompt", instance.prompt)
-        instance.strategy_code = validated_data.get(
-            "strategy_code", instance.strategy_code
-        )
-        instance.parameters = validated_data.get("parameters", instance.parameters)
-        instance.save()
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        # Only write the columns that were actually provided, and the timestamp
+        update_fields = list(validated_data.keys())
+        if update_fields:
+            update_fields.append("updated_at")
+        instance.save(update_fields=update_fields or None)
         return instance
@@ -0,0 +1,426 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from backtester.models import BacktestJob, Strategy
+from backtester.utils.processes import FORKSERVER_CONTEXT
+
+logger = logging.getLogger(__name__)
+
+# Generated strategies are reused for the same prompt (and code) for a day
+STRATEGY_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Error messages stored for and sent to clients are cut to this many characters
+MAX_ERROR_LENGTH = 2048
+
+# Runs strategy generations after the request that queued them has returned
+_GENERATION_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="strategy")
+
+# Queued jobs only live in this process, a restart loses them. Generations still
+# pending this many seconds after they started are assumed lost and marked as failed.
+STRATEGY_GENERATION_TIMEOUT = 60 * 30
+
+INTERRUPTED_ERROR = "Processing was interrupted by a server restart, please retry."
+
+# Jobs lost by other or earlier server processes are swept at most this often
+STALE_SWEEP_INTERVAL = 60
+_last_stale_sweep = 0.0
+_stale_sweep_lock = threading.Lock()
+
+# Backtests are deterministic, so their results are reused for a day
+BACKTEST_CACHE_TIMEOUT = 60 * 60 * 24
+
+BACKTEST_DATA_DIRECTORY = "utils/data"
+
+# Backtests are killed after this many seconds so they can't hold a worker forever
+BACKTEST_TIME_LIMIT = 60 * 30
+
+# Each backtest already fans out over the assets in its own processes
+_BACKTEST_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="backtest")
+
+# Each backtest thread runs its backtests in a long-lived worker process, whose
+# in-memory caches of asset data and compiled strategies outlive single jobs.
+# Workers are keyed by thread id and replaced when they die or are killed.
+_BACKTEST_WORKERS = {}
+_BACKTEST_WORKERS_LOCK = threading.Lock()
+
+# Backtests still running this many seconds after they started are assumed lost
+# to a restart, a live one is killed at BACKTEST_TIME_LIMIT
+BACKTEST_STALE_TIMEOUT = BACKTEST_TIME_LIMIT + 60 * 5
+
+
+def error_message(error):
+    """
+    Return the message of an exception, cut to MAX_ERROR_LENGTH characters.
+    """
+    message = str(error)
+    if len(message) > MAX_ERROR_LENGTH:
+        message = f"{message[:MAX_ERROR_LENGTH]}..."
+    return message
+
+
+def strategy_cache_key(prompt, strategy_code=None):
+    """
+    Build the cache key of a generated or modified strategy.
+
+    Prompts are compared case- and whitespace-insensitively. A modification is
+    also keyed on the code it modifies.
+    """
+    normalized_prompt = " ".join(prompt.lower().split())
+    digest = hashlib.sha256(normalized_prompt.encode())
+    if strategy_code:
+        digest.update(b"\0" + strategy_code.encode())
+    return f"strategy:{digest.hexdigest()}"
+
+
+def get_cached_strategy(prompt, strategy_code=None):
+    """
+    Return the cached (strategy_code, parameters) for a prompt, or None.
+    """
+    return cache.get(strategy_cache_key(prompt, strategy_code))
+
+
+def generate_strategy(prompt, strategy_code=None):
+    """
+    Generate or modify a strategy based on prompt and strategy_code.
+    Results are cached, so a repeated request skips the LLM entirely.
+    """
+    cache_key = strategy_cache_key(prompt, strategy_code)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info("Using cached strategy for prompt.")
+        return cached
+
+    # The LLM stack is only loaded once a strategy is actually generated
+    from backtester.utils.strategy_generator import get_strategy_generator
+
+    strategy_generator = get_strategy_generator()
+    try:
+        if strategy_code:
+            # Modify strategy
+            strategy_code, parameters = strategy_generator.modify_strategy(
+                strategy_code, prompt
+            )
+        else:
+            # Generate new strategy
+            strategy_code, parameters = strategy_generator.generate_strategy(prompt)
+
+        logger.info("Strategy processed successfully with parameters: %s", parameters)
+        cache.set(cache_key, (strategy_code, parameters), STRATEGY_CACHE_TIMEOUT)
+        return strategy_code, parameters
+    except ValueError as e:
+        logger.error("Error generating strategy: %s", error_message(e))
+        raise
+
+
+def stream_strategy(prompt, strategy_code=None):
+    """
+    Like `generate_strategy`, but yields the code as it is generated, followed
+    by a dict with the final strategy_code and parameters.
+    """
+    cache_key = strategy_cache_key(prompt, strategy_code)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info("Using cached strategy for prompt.")
+        strategy_code, parameters = cached
+        yield {"strategy_code": strategy_code, "parameters": parameters}
+        return
+
+    from backtester.utils.strategy_generator import get_strategy_generator
+
+    for chunk in get_strategy_generator().stream_strategy(prompt, strategy_code):
+        if isinstance(chunk, dict):
+            cache.set(
+                cache_key,
+                (chunk["strategy_code"], chunk["parameters"]),
+                STRATEGY_CACHE_TIMEOUT,
+            )
+        yield chunk
+
+
+def run_strategy_generation(strategy_id, prompt, strategy_code=None):
+    """
+    Generate or modify the strategy of a pending Strategy row and store the outcome.
+
+    The outcome is only stored while the row is still pending from this run, so
+    a generation that was failed as stale, or superseded by a newer update of
+    the strategy, doesn't overwrite the row.
+    """
+    sweep_stale_jobs()
+    started_at = timezone.now()
+    try:
+        started = Strategy.objects.filter(
+            pk=strategy_id, status=Strategy.Status.PENDING, started_at=None
+        ).update(started_at=started_at)
+        if not started:
+            logger.info("Strategy %s is no longer queued, skipping it", strategy_id)
+            return
+        this_run = Strategy.objects.filter(
+            pk=strategy_id, status=Strategy.Status.PENDING, started_at=started_at
+        )
+
+        try:
+            strategy_code, parameters = generate_strategy(prompt, strategy_code)
+        except Exception as e:
+            if not isinstance(e, ValueError):
+                logger.exception("Unexpected error generating strategy %s", strategy_id)
+            this_run.update(
+                status=Strategy.Status.FAILED,
+                error=error_message(e),
+                updated_at=timezone.now(),
+            )
+            return
+        this_run.update(
+            strategy_code=strategy_code,
+            parameters=parameters,
+            status=Strategy.Status.READY,
+            error="",
+            updated_at=timezone.now(),
+        )
+    finally:
+        # Each worker thread opens its own connection, don't leave it dangling
+        connection.close()
+
+
+def fail_stale_strategies(older_than=STRATEGY_GENERATION_TIMEOUT):
+    """
+    Mark strategies whose generation started more than older_than seconds ago
+    and is still pending as failed.
+
+    With older_than=None every pending strategy is marked, including queued
+    ones. That is only safe when no generation can be live, before the server starts.
+
+    Returns:
+        int: The number of strategies marked as failed.
+    """
+    now = timezone.now()
+    stale = Strategy.objects.filter(status=Strategy.Status.PENDING)
+    if older_than is not None:
+        stale = stale.filter(started_at__lte=now - timedelta(seconds=older_than))
+    failed = stale.update(
+        status=Strategy.Status.FAILED, error=INTERRUPTED_ERROR, updated_at=now
+    )
+    if failed:
+        logger.warning("Marked %d interrupted strategy generation(s) as failed", failed)
+    return failed
+
+
+def sweep_stale_jobs():
+    """
+    Fail the stale strategies and backtests, at most once per STALE_SWEEP_INTERVAL.
+
+    Called by the background jobs rather than on reads, so polling requests
+    stay a single query.
+    """
+    global _last_stale_sweep
+    with _stale_sweep_lock:
+        now = time.monotonic()
+        if now - _last_stale_sweep < STALE_SWEEP_INTERVAL:
+            return
+        _last_stale_sweep = now
+    try:
+        fail_stale_strategies()
+        fail_stale_backtests()
+    except Exception:
+        logger.exception("Failed to sweep stale jobs")
+
+
+def enqueue_strategy_generation(strategy_id, prompt, strategy_code=None):
+    """
+    Queue the generation of a pending strategy once the current transaction commits.
+    """
+    transaction.on_commit(
+        lambda: _GENERATION_POOL.submit(
+            run_strategy_generation, strategy_id, prompt, strategy_code
+        )
+    )
+
+
+def backtest_cache_key(backtest_parameters):
+    """
+    Build the cache key of a backtest from everything that determines its results.
+
+    Plots don't change the results, so generate_plots is left out of the key.
+    """
+    key_parameters = {
+        field: value
+        for field, value in backtest_parameters.items()
+        if field != "generate_plots"
+    }
+    payload = json.dumps(key_parameters, sort_keys=True, default=str)
+    return f"backtest:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def get_cached_backtest(backtest_parameters):
+    """
+    Return the cached results of a backtest, or None.
+    """
+    return cache.get(backtest_cache_key(backtest_parameters))
+
+
+def _get_backtest_worker():
+    """
+    Return the (process, connection) of the current thread's backtest worker,
+    starting a new worker if there is none or it died.
+    """
+    thread_id = threading.get_ident()
+    worker = _BACKTEST_WORKERS.get(thread_id)
+    if worker is not None and worker[0].is_alive():
+        return worker
+    _stop_backtest_worker(thread_id)
+
+    # Backtrader and pandas are only loaded by the backtest workers
+    from backtester.utils.backtester import serve_backtests
+
+    connection, child_connection = FORKSERVER_CONTEXT.Pipe()
+    process = FORKSERVER_CONTEXT.Process(
+        target=serve_backtests,
+        args=(
+            child_connection,
+            BACKTEST_DATA_DIRECTORY,
+            MAX_ERROR_LENGTH,
+            settings.LOGGING,
+        ),
+        name="backtest-worker",
+    )
+    process.start()
+    child_connection.close()
+    with _BACKTEST_WORKERS_LOCK:
+        _BACKTEST_WORKERS[thread_id] = (process, connection)
+    return process, connection
+
+
+def _stop_backtest_worker(thread_id):
+    """
+    Kill the backtest worker of a thread, along with the processes it started.
+    """
+    with _BACKTEST_WORKERS_LOCK:
+        worker = _BACKTEST_WORKERS.pop(thread_id, None)
+    if worker is None:
+        return
+    process, connection = worker
+    connection.close()
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # Not leading its group yet, or already gone
+        process.kill()
+    process.join()
+
+
+@atexit.register
+def _stop_backtest_workers():
+    """
+    Kill all backtest workers, which would otherwise keep the process from exiting.
+    """
+    for thread_id in list(_BACKTEST_WORKERS):
+        _stop_backtest_worker(thread_id)
+
+
+def run_backtest(backtest_parameters, time_limit=BACKTEST_TIME_LIMIT):
+    """
+    Run a backtest in the current thread's worker process, killing the worker
+    after time_limit seconds.
+
+    Raises:
+        TimeoutError: If the backtest takes longer than time_limit.
+        ValueError: If the backtest fails.
+    """
+    _, worker_connection = _get_backtest_worker()
+    try:
+        worker_connection.send(backtest_parameters)
+        finished = worker_connection.poll(time_limit)
+        outcome, payload = worker_connection.recv() if finished else (None, None)
+    except (EOFError, BrokenPipeError):
+        _stop_backtest_worker(threading.get_ident())
+        raise ValueError("Backtest process exited unexpectedly.")
+
+    if not finished:
+        _stop_backtest_worker(threading.get_ident())
+        raise TimeoutError(f"Backtest exceeded the time limit of {time_limit}s.")
+    if outcome == "error":
+        raise ValueError(payload)
+    return payload
+
+
+def run_backtest_job(job_id):
+    """
+    Run the backtest of a pending BacktestJob and store the outcome.
+
+    The outcome is only stored while the job is still running, so a job that
+    was failed as stale in the meantime stays failed.
+    """
+    sweep_stale_jobs()
+    try:
+        started = BacktestJob.objects.filter(
+            pk=job_id, status=BacktestJob.Status.PENDING
+        ).update(status=BacktestJob.Status.RUNNING, started_at=timezone.now())
+        if not started:
+            logger.info("Backtest job %s is no longer pending, skipping it", job_id)
+            return
+        running = BacktestJob.objects.filter(
+            pk=job_id, status=BacktestJob.Status.RUNNING
+        )
+        parameters = running.values_list("parameters", flat=True).get()
+
+        try:
+            results = run_backtest(parameters)
+        except Exception as e:
+            if not isinstance(e, (ValueError, TimeoutError)):
+                logger.exception("Unexpected error running backtest job %s", job_id)
+            else:
+                logger.error(
+                    "Error running backtest job %s: %s", job_id, error_message(e)
+                )
+            running.update(status=BacktestJob.Status.FAILED, error=error_message(e))
+            return
+        logger.info("Backtest job %s completed successfully.", job_id)
+        cache.set(backtest_cache_key(parameters), results, BACKTEST_CACHE_TIMEOUT)
+        running.update(status=BacktestJob.Status.READY, results=results)
+    finally:
+        connection.close()
+
+
+def fail_stale_backtests(older_than=BACKTEST_STALE_TIMEOUT):
+    """
+    Mark backtest jobs started more than older_than seconds ago and still
+    running as failed.
+
+    With older_than=None every pending or running job is marked, including
+    queued ones. That is only safe when no job can be live, before the server starts.
+
+    Returns:
+        int: The number of jobs marked as failed.
+    """
+    if older_than is None:
+        stale = BacktestJob.objects.filter(
+            status__in=(BacktestJob.Status.PENDING, BacktestJob.Status.RUNNING)
+        )
+    else:
+        stale = BacktestJob.objects.filter(
+            status=BacktestJob.Status.RUNNING,
+            started_at__lte=timezone.now() - timedelta(seconds=older_than),
+        )
+    failed = stale.update(status=BacktestJob.Status.FAILED, error=INTERRUPTED_ERROR)
+    if failed:
+        logger.warning("Marked %d interrupted backtest job(s) as failed", failed)
+    return failed
+
+
+def enqueue_backtest(job_id):
+    """
+    Queue a pending backtest job once the current transaction commits.
+    """
+    transaction.on_commit(lambda: _BACKTEST_POOL.submit(run_backtest_job, job_id))
@@ -1,8 +1,19 @@
-from .backtester import Backtester
-from .code_validator import CodeValidator
-from .llm_interface import LLMInterface
-from .strategy_generator import StrategyGenerator
+import importlib
 
-strategy_generator = StrategyGenerator()
+# Exports are imported on first access, so importing one utility module doesn't
+# load Backtrader, pandas and the LLM clients along with it
+_EXPORTS = {
+    "StrategyGenerator": ".strategy_generator",
+    "get_strategy_generator": ".strategy_generator",
+    "Backtester": ".backtester",
+    "LLMInterface": ".llm_interface",
+    "CodeValidator": ".code_validator",
+}
 
 __all__ = ["StrategyGenerator", "Backtester", "LLMInterface", "CodeValidator"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -1,16 +1,56 @@
+import functools
 import logging
+import logging.config
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 import backtrader as bt
+import numpy as np
+import pandas as pd
 
 from backtester.utils.data_loader import DataLoader
 from backtester.utils.metrics import Metrics
 from backtester.utils.plotter import generate_and_save_plot
+from backtester.utils.shared_frame import SharedFrame
+from backtester.utils.vectorized import (
+    SIGNAL_FUNCTION_NAME,
+    run_vectorized_backtest,
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Names strategy code may use without importing them, as it could when it ran in
+# this module's globals
+STRATEGY_NAMESPACE = {
+    "bt": bt,
+    "datetime": datetime,
+    "logging": logging,
+    "np": np,
+    "pd": pd,
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_strategy(strategy_code):
+    """
+    Compiles the strategy code, memoized in memory so repeated backtests of the
+    same strategy, and the worker processes forked for them, skip compilation.
+
+    Generated strategies are nearly unique per request, so the bytecode isn't
+    persisted, a disk cache of it would only grow.
+
+    The cache is keyed on the source itself, which the lookup hashes once and
+    compares only on a hash match.
+
+    Args:
+        strategy_code (str): The code for the strategy.
+
+    Returns:
+        code: The compiled code object.
+    """
+    return compile(strategy_code, "<strategy>", "exec")
+
 
 class Backtester:
     """
@@ -59,6 +99,21 @@ class Backtester:
         self.initial_cash = initial_cash
         self.data_loader = DataLoader(data_directory)
         self.generate_plots = generate_plots
+        self._compiled = _compile_strategy(strategy_code)
+        self._strategy_class = None
+        self._signal_function = None
+
+    def __getstate__(self):
+        # Code objects and exec-defined classes don't pickle; workers rebuild them
+        state = self.__dict__.copy()
+        state["_compiled"] = None
+        state["_strategy_class"] = None
+        state["_signal_function"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compiled = _compile_strategy(self.strategy_code)
 
     def run_backtest(self):
         """
@@ -67,52 +122,106 @@ class Backtester:
         Returns:
             dict: The calculated metrics for the backtest.
         """
-        logger.info("Starting Backtest")
-        logger.info("Assets: %s", ", ".join(self.assets))
         logger.info(
-            "Date Range: %s to %s", self.start_date.date(), self.end_date.date()
+            "Starting Backtest: assets=%s range=%s..%s cash=$%.2f params=%s",
+            self.assets,
+            self.start_date.date(),
+            self.end_date.date(),
+            self.initial_cash,
+            self.parameters,
         )
-        logger.info("Initial Cash: $%.2f", self.initial_cash)
-        logger.info("Strategy Parameters: %s", self.parameters)
 
-        all_results = []
-        for asset in self.assets:
-            logger.info("Backtesting asset: %s", asset)
-            results = self._run_single_asset_backtest(asset)
-            all_results.append(results)
+        # Fail fast on invalid strategy code before dispatching any workers
+        self._load_strategy()
 
-        metrics = Metrics.calculate(all_results)
+        # Data is loaded once here and shared with the workers without pickling
+        frames = self.data_loader.load_frames(
+            self.assets, self.start_date, self.end_date
+        )
+        shared_frames = {}
+        results_by_asset = {}
+        try:
+            for asset, df in zip(self.assets, frames):
+                shared_frames[asset] = SharedFrame(df)
+
+            max_workers = max(1, min(len(self.assets), os.cpu_count() or 1))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._run_single_asset_backtest, asset, shared_frame
+                    ): asset
+                    for asset, shared_frame in shared_frames.items()
+                }
+                for future in as_completed(futures):
+                    asset = futures[future]
+                    results_by_asset[asset] = future.result()
+                    logger.info("Finished backtesting asset: %s", asset)
+        finally:
+            for shared_frame in shared_frames.values():
+                shared_frame.unlink()
+
+        all_results = [results_by_asset[asset] for asset in self.assets]
+        metrics = Metrics.aggregate(all_results)
         self._print_results(metrics)
 
         return metrics
 
-    def _run_single_asset_backtest(self, asset):
+    def _run_single_asset_backtest(self, asset, shared_frame):
         """
         Runs the backtest on a single asset.
 
+        This runs in a worker process, so the strategy class is re-created
+        from the source code locally and only the picklable metrics are
+        returned to the parent.
+
+        Args:
+            asset (str): The asset to run the backtest on.
+            shared_frame (SharedFrame): The data for the asset in shared memory.
+
+        Returns:
+            dict: The calculated metrics of the backtest for the asset.
+        """
+        return shared_frame.apply(self._backtest_frame, asset)
+
+    def _backtest_frame(self, df, asset):
+        """
+        Runs the backtest on the data of a single asset.
+
         Args:
+            df (pd.DataFrame): The data for the asset.
             asset (str): The asset to run the backtest on.
 
         Returns:
-            list: The results of the backtest for the asset.
+            dict: The calculated metrics of the backtest for the asset.
         """
+        logger.info("Backtesting asset: %s", asset)
+        strategy_class = self._load_strategy()
+        if self._signal_function is not None:
+            return self._run_vectorized_backtest(df, asset)
+
         cerebro = bt.Cerebro()
 
         # Add the strategy
-        strategy_class = self._load_strategy()
         cerebro.addstrategy(strategy_class, **self.parameters)
         logger.info("Using Strategy: %s", strategy_class.__name__)
 
         # Add the data
-        data_feed = self._load_data(asset)
+        data_feed = self.data_loader.create_feed(df)
         cerebro.adddata(data_feed, name=asset)
-        df = data_feed.p.dataname
-        logger.info("Loaded data for asset: %s", asset)
-        logger.info("  Timeframe: %s", data_feed.p.timeframe)
-        logger.info("  Compression: %s", data_feed.p.compression)
-        logger.info("  From: %s", df.index.min())
-        logger.info("  To: %s", df.index.max())
-        logger.info("  Number of bars: %d", len(df))
+        if logger.isEnabledFor(logging.INFO):
+            # DataLoader sorts the index, so its bounds are the first and last entries
+            index = data_feed.p.dataname.index
+            bars = len(index)
+            logger.info(
+                "Loaded data for asset: %s\n  Timeframe: %s\n  Compression: %s\n"
+                "  From: %s\n  To: %s\n  Number of bars: %d",
+                asset,
+                data_feed.p.timeframe,
+                data_feed.p.compression,
+                index[0] if bars else None,
+                index[-1] if bars else None,
+                bars,
+            )
 
         # Set the initial cash
         cerebro.broker.set_cash(self.initial_cash)
@@ -127,13 +236,31 @@ class Backtester:
         # Run the backtest
         results = cerebro.run()
 
-        # Generate and save plots if requested
+        # Generate and save plots if requested, before the shared frame is released
         if self.generate_plots:
             plot_filename = f"backtest_plot_{asset}_{self.start_date.date()}_{self.end_date.date()}.html"
             generate_and_save_plot(cerebro, plot_filename)
             logger.info("Generated plot: %s", plot_filename)
 
-        return results
+        return Metrics._calculate_single(results[0])
+
+    def _run_vectorized_backtest(self, df, asset):
+        """
+        Runs a vectorized strategy on a single asset, bypassing Backtrader.
+
+        Args:
+            df (pd.DataFrame): The data for the asset.
+            asset (str): The asset to run the backtest on.
+
+        Returns:
+            dict: The calculated metrics of the backtest for the asset.
+        """
+        logger.info("Using vectorized strategy on %d bars of %s", len(df), asset)
+        if self.generate_plots:
+            logger.warning("Plots are not available for vectorized strategies.")
+        return run_vectorized_backtest(
+            self._signal_function, df, self.parameters, self.initial_cash
+        )
 
     def _print_results(self, metrics):
         """
@@ -160,32 +287,65 @@ class Backtester:
         Args:
             metrics (dict): The metrics to print.
         """
-        for key, value in metrics.items():
-            if key != "trade_analysis":
-                if isinstance(value, float):
-                    logger.info("%s: %.4f", key, value)
-                else:
-                    logger.info("%s: %s", key, value)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        lines = [
+            f"{key}: {self._format_value(value)}"
+            for key, value in metrics.items()
+            if key != "trade_analysis"
+        ]
+        lines.append("Trade Analysis:")
+        lines.extend(
+            f"  {key}: {self._format_value(value)}"
+            for key, value in metrics["trade_analysis"].items()
+        )
+        logger.info("\n".join(lines))
+
+    @staticmethod
+    def _format_value(value):
+        """
+        Formats a metric value for logging.
+
+        Args:
+            value: The metric value.
 
-        logger.info("Trade Analysis:")
-        for key, value in metrics["trade_analysis"].items():
-            if isinstance(value, float):
-                logger.info("  %s: %.4f", key, value)
-            else:
-                logger.info("  %s: %s", key, value)
+        Returns:
+            str: The formatted value.
+        """
+        return f"{value:.4f}" if isinstance(value, float) else str(value)
 
     def _load_strategy(self):
         """
         Dynamically loads the strategy class from the provided strategy code.
+        The resolved class is cached so the code is only executed once.
+
+        Strategy code declaring `__vectorized__ = True` defines a signal function
+        instead (see backtester.utils.vectorized), which is cached in
+        `_signal_function` to be run without Backtrader, and None is returned.
 
         Returns:
-            class: The strategy class.
+            class: The strategy class, or None for a vectorized strategy.
 
         Raises:
-            ValueError: If no valid strategy class is found in the provided code.
+            ValueError: If no valid strategy class or signal function is found in the provided code.
         """
-        namespace = {}
-        exec(self.strategy_code, globals(), namespace)
+        if self._strategy_class or self._signal_function:
+            return self._strategy_class
+
+        # A single namespace makes the code's own imports visible to its functions
+        namespace = {"__name__": __name__, **STRATEGY_NAMESPACE}
+        exec(self._compiled, namespace)
+
+        if namespace.get("__vectorized__"):
+            signal_function = namespace.get(SIGNAL_FUNCTION_NAME)
+            if not callable(signal_function):
+                error_msg = f"Vectorized strategy must define a {SIGNAL_FUNCTION_NAME} function."
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            self._signal_function = signal_function
+            return None
+
         strategy_class = next(
             (
                 v
@@ -197,17 +357,45 @@ class Backtester:
         if not strategy_class:
             logger.error("No valid strategy class found in the provided code.")
             raise ValueError("No valid strategy class found in the provided code.")
+        self._strategy_class = strategy_class
         return strategy_class
 
-    def _load_data(self, asset):
-        """
-        Loads the historical data for the given asset.
-
-        Args:
-            asset (str): The asset to load data for.
 
-        Returns:
-            bt.feeds.DataBase: The data feed for the asset.
-        """
-        logger.info("Loading data for asset: %s", asset)
-        return self.data_loader.load_data([asset], self.start_date, self.end_date)[0]
+def serve_backtests(connection, data_directory, max_error_length, logging_config=None):
+    """
+    Runs the backtests received through a connection one after another, as the
+    target of a long-lived worker process, answering each with ("ok", metrics)
+    or ("error", message). Returns once the other end closes the connection.
+
+    The worker keeps its in-memory caches of asset data and compiled strategies
+    between backtests. It leads its own process group, so killing the group on
+    a timeout also kills the per-asset workers it starts.
+
+    Args:
+        connection (multiprocessing.connection.Connection): The worker's end of a duplex pipe,
+            receiving keyword arguments for Backtester, besides data_directory.
+        data_directory (str): The directory where data is stored.
+        max_error_length (int): The number of characters an error message is cut to.
+        logging_config (dict, optional): A `logging.config.dictConfig` configuration.
+            Processes started by the forkserver don't inherit the parent's logging setup.
+    """
+    os.setpgrp()
+    if logging_config:
+        logging.config.dictConfig(logging_config)
+    while True:
+        try:
+            backtest_parameters = connection.recv()
+        except EOFError:
+            break
+        try:
+            backtester = Backtester(data_directory=data_directory, **backtest_parameters)
+            outcome = ("ok", backtester.run_backtest())
+        except Exception as e:
+            # The traceback is logged once here, only the message goes back
+            logger.exception("Backtest failed")
+            message = str(e)
+            if len(message) > max_error_length:
+                message = f"{message[:max_error_length]}..."
+            outcome = ("error", message)
+        connection.send(outcome)
+    connection.close()
@@ -1,16 +1,109 @@
 import ast
+import asyncio
+import contextlib
+import functools
+import io
 import logging
 import os
 import subprocess
 import sys
 import tempfile
-from typing import Dict, Any, Tuple
+import threading
+import time
+import traceback
+from typing import Dict, Any, Optional, Tuple
+
+from .processes import FORKSERVER_CONTEXT
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+SANDBOX_TIMEOUT = 5
+
+# How often a running sandbox checks whether its validation was cancelled
+SANDBOX_POLL_INTERVAL = 0.1
+
+# Corrections are requested at these temperatures in parallel, the first valid one wins
+CORRECTION_TEMPERATURES = (0.1, 0.3, 0.7)
+
+
+def _execute_code(code: str, conn) -> None:
+    """
+    Executes the given code and sends the outcome through the connection.
+    Meant to run in a child process of the forkserver.
+
+    Args:
+        code (str): The Python code to execute.
+        conn: The connection to send a (success, output) tuple through.
+    """
+    stdout = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout):
+            exec(compile(code, "<sandbox>", "exec"), {"__name__": "__main__"})
+        conn.send((True, stdout.getvalue()))
+    except SystemExit as e:
+        conn.send((e.code in (None, 0), stdout.getvalue()))
+    except BaseException:
+        conn.send((False, traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+@functools.lru_cache(maxsize=1)
+def get_code_validator() -> "CodeValidator":
+    """
+    Returns the process-wide CodeValidator, using the shared LLM interface.
+
+    Returns:
+        CodeValidator: The shared code validator.
+
+    Raises:
+        ValueError: If the OPENAI_API_KEY is not found in the environment variables.
+    """
+    # Imported here, sandbox processes import this module without the LLM clients
+    from .llm_interface import get_llm_interface
+
+    return CodeValidator(get_llm_interface())
+
+
+class _ClassFound(Exception):
+    """
+    Raised by _ClassFinder to stop the traversal once the class is found.
+    """
+
+
+class _ClassFinder(ast.NodeVisitor):
+    """
+    Finds the first class definition with the given name, stopping as soon as
+    it is found and without descending into function bodies.
+
+    Attributes:
+        name (str): The name of the class to find.
+        found (ast.ClassDef): The class definition node, or None if not found.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.found = None
+
+    def find(self, tree: ast.AST) -> None:
+        try:
+            self.visit(tree)
+        except _ClassFound:
+            pass
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        if node.name == self.name:
+            self.found = node
+            raise _ClassFound
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        return
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+
 class CodeValidator:
     """
     A class to validate and correct Python code through an LLM interface.
@@ -18,31 +111,51 @@ class CodeValidator:
 
     Attributes:
         llm_interface: An interface that provides LLM-driven corrections to the code.
+        strict_isolation (bool): Whether to execute code in a fresh interpreter
+            instead of a child process of the forkserver.
     """
 
-    def __init__(self, llm_interface):
+    def __init__(self, llm_interface, strict_isolation: bool = False):
         """
         Initializes the CodeValidator with a given LLM interface.
 
         Args:
             llm_interface: The LLM interface to correct strategies.
+            strict_isolation (bool): Whether to execute code in a fresh interpreter. Default is False.
         """
         self.llm_interface = llm_interface
+        self.strict_isolation = strict_isolation
 
-    def validate_code(self, code: str) -> Tuple[bool, str]:
+    def validate_code(
+        self, code: str, cancelled: Optional[threading.Event] = None
+    ) -> Tuple[bool, str]:
         """
         Validates the provided Python code by executing it in a sandbox.
 
         Args:
             code (str): The Python code to validate.
+            cancelled (threading.Event, optional): Once set, the validation is
+                skipped, or its sandbox stopped if it is already running.
 
         Returns:
             Tuple[bool, str]: A tuple where the first element indicates whether the code is valid,
                               and the second element contains the error message if validation fails.
         """
+        if cancelled is not None and cancelled.is_set():
+            logger.info("Validation cancelled.")
+            return False, "Validation cancelled."
+
         logger.info("Validating the code.")
+        # Syntax errors don't need a sandbox run to be detected
         try:
-            self.execute_in_sandbox(code)
+            ast.parse(code)
+        except SyntaxError as e:
+            error_message = f"Validation error: SyntaxError: {e}"
+            logger.error(error_message)
+            return False, error_message
+
+        try:
+            self.execute_in_sandbox(code, cancelled)
             logger.info("Code validated successfully.")
             return True, ""
         except Exception as e:
@@ -50,9 +163,65 @@ class CodeValidator:
             logger.error(error_message)
             return False, error_message
 
-    def execute_in_sandbox(self, code: str) -> None:
+    def execute_in_sandbox(
+        self, code: str, cancelled: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Executes the given code in a sandbox process.
+
+        By default the code runs in a child process of the forkserver, which
+        has Backtrader, pandas and NumPy preloaded, avoiding the interpreter
+        startup, imports and temporary file of a fresh subprocess. With strict
+        isolation enabled it runs in a fresh interpreter instead.
+
+        Args:
+            code (str): The Python code to execute.
+            cancelled (threading.Event, optional): Once set, the sandbox process
+                is killed. Not supported with strict isolation.
+
+        Raises:
+            RuntimeError: If the code execution fails, times out or is cancelled.
+        """
+        if self.strict_isolation:
+            self._execute_in_subprocess(code)
+            return
+
+        logger.info("Executing the code in a forkserver sandbox.")
+        parent_conn, child_conn = FORKSERVER_CONTEXT.Pipe(duplex=False)
+        process = FORKSERVER_CONTEXT.Process(
+            target=_execute_code, args=(code, child_conn)
+        )
+        process.start()
+        child_conn.close()
+        deadline = time.monotonic() + SANDBOX_TIMEOUT
+        try:
+            while not parent_conn.poll(SANDBOX_POLL_INTERVAL):
+                if cancelled is not None and cancelled.is_set():
+                    logger.info("Execution cancelled.")
+                    raise RuntimeError("Execution cancelled.")
+                if time.monotonic() >= deadline:
+                    logger.error("Execution timed out.")
+                    raise RuntimeError("Execution timed out.")
+            success, output = parent_conn.recv()
+        except EOFError:
+            process.join()
+            error = f"Sandbox process exited with code {process.exitcode}"
+            logger.error(f"Execution error: {error}")
+            raise RuntimeError(f"Execution error: {error}")
+        finally:
+            parent_conn.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+        if not success:
+            logger.error(f"Execution error: {output}")
+            raise RuntimeError(f"Execution error: {output}")
+        logger.info(f"Execution Output: {output}")
+
+    def _execute_in_subprocess(self, code: str) -> None:
         """
-        Executes the given code in a temporary sandbox environment.
+        Executes the given code in a fresh interpreter from a temporary file.
 
         Args:
             code (str): The Python code to execute.
@@ -60,7 +229,7 @@ class CodeValidator:
         Raises:
             RuntimeError: If the code execution fails or times out.
         """
-        logger.info("Executing the code in a sandbox.")
+        logger.info("Executing the code in a subprocess sandbox.")
         with tempfile.NamedTemporaryFile("w", delete=False, suffix=".py") as tmp_file:
             tmp_file.write(code)
             tmp_file_path = tmp_file.name
@@ -70,7 +239,7 @@ class CodeValidator:
                 [sys.executable, tmp_file_path],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                timeout=5,
+                timeout=SANDBOX_TIMEOUT,
                 check=True,
                 text=True,
             )
@@ -96,31 +265,30 @@ class CodeValidator:
             Dict[str, Any]: A dictionary of parameter names and their respective values.
         """
         logger.info("Extracting parameters from the code.")
-        tree = ast.parse(code)
+        finder = _ClassFinder("MyStrategy")
+        finder.find(ast.parse(code))
         parameters = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef) and node.name == "MyStrategy":
-                for subnode in node.body:
-                    if isinstance(subnode, ast.Assign):
-                        for target in subnode.targets:
-                            if isinstance(target, ast.Name) and target.id == "params":
-                                if isinstance(subnode.value, ast.Tuple):
-                                    for elt in subnode.value.elts:
-                                        if (
-                                            isinstance(elt, ast.Tuple)
-                                            and len(elt.elts) == 2
-                                        ):
-                                            key = (
-                                                elt.elts[0].s
-                                                if isinstance(elt.elts[0], ast.Str)
-                                                else elt.elts[0].value
-                                            )
-                                            value = (
-                                                elt.elts[1].n
-                                                if isinstance(elt.elts[1], ast.Num)
-                                                else elt.elts[1].value
-                                            )
-                                            parameters[key] = value
+        if finder.found is None:
+            logger.info("No 'MyStrategy' class found in the code.")
+            return parameters
+
+        for subnode in finder.found.body:
+            if not isinstance(subnode, ast.Assign) or not isinstance(
+                subnode.value, ast.Tuple
+            ):
+                continue
+            if not any(
+                isinstance(target, ast.Name) and target.id == "params"
+                for target in subnode.targets
+            ):
+                continue
+            for elt in subnode.value.elts:
+                if (
+                    isinstance(elt, ast.Tuple)
+                    and len(elt.elts) == 2
+                    and isinstance(elt.elts[0], ast.Constant)
+                ):
+                    parameters[elt.elts[0].value] = ast.literal_eval(elt.elts[1])
         logger.info(f"Extracted parameters: {parameters}")
         return parameters
 
@@ -130,6 +298,28 @@ class CodeValidator:
         """
         Validates the provided strategy code and attempts to correct it using the LLM interface if validation fails.
 
+        Args:
+            strategy_code (str): The Python code to validate and correct.
+            max_attempts (int): The maximum number of validation attempts. Default is 3.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: A tuple containing the corrected code and a dictionary of extracted parameters.
+
+        Raises:
+            ValueError: If the strategy could not be validated after the maximum number of attempts.
+        """
+        return self.llm_interface.run(
+            self.acheck_and_correct_strategy(strategy_code, max_attempts)
+        )
+
+    async def acheck_and_correct_strategy(
+        self, strategy_code: str, max_attempts: int = 3
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Asynchronous version of `check_and_correct_strategy`. Each correction
+        round requests several corrections concurrently and continues with the
+        first one that validates.
+
         Args:
             strategy_code (str): The Python code to validate and correct.
             max_attempts (int): The maximum number of validation attempts. Default is 3.
@@ -143,27 +333,105 @@ class CodeValidator:
         logger.info(
             f"Checking and correcting strategy with a maximum of {max_attempts} attempts."
         )
+        is_valid, validation_error = await asyncio.to_thread(
+            self.validate_code, strategy_code
+        )
         attempts = 0
-        while attempts < max_attempts:
-            is_valid, validation_error = self.validate_code(strategy_code)
-            if is_valid:
-                logger.info("Strategy validated successfully.")
-                parameters = self.extract_parameters(strategy_code)
-                return strategy_code, parameters
-
+        while not is_valid:
             attempts += 1
             logger.warning(
                 f"Validation failed on attempt {attempts}. Error: {validation_error}"
             )
-            if attempts == max_attempts:
+            if attempts >= max_attempts:
                 error_msg = f"Failed to validate the strategy after {max_attempts} attempts. Last error: {validation_error}"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
 
-            strategy_code = self.llm_interface.correct_strategy(
+            strategy_code, is_valid, validation_error = await self._acorrect_strategy(
                 strategy_code, validation_error
             )
-            logger.info(f"Strategy corrected by LLM interface. Retrying...")
+            logger.info("Strategy corrected by LLM interface.")
 
-        logger.error("Unexpected error in strategy correction.")
-        raise ValueError("Unexpected error in strategy correction.")
+        logger.info("Strategy validated successfully.")
+        parameters = self.extract_parameters(strategy_code)
+        return strategy_code, parameters
+
+    async def _acorrect_strategy(
+        self, strategy_code: str, validation_error: str
+    ) -> Tuple[str, bool, str]:
+        """
+        Requests one correction per temperature in CORRECTION_TEMPERATURES concurrently,
+        returning the first one that validates and cancelling the others.
+
+        Cancelling a task doesn't stop a validation already running in a thread,
+        so the others are also signalled to skip or stop their sandbox runs.
+
+        Args:
+            strategy_code (str): The Python code that failed validation.
+            validation_error (str): The validation error of the code.
+
+        Returns:
+            Tuple[str, bool, str]: The corrected code, whether it is valid, and its
+                validation error. If no correction validates, the first one to complete.
+
+        Raises:
+            Exception: The first error of the correction requests, if all of them failed.
+        """
+        cancelled = threading.Event()
+        tasks = [
+            asyncio.create_task(
+                self._acorrect_and_validate(
+                    strategy_code, validation_error, temperature, cancelled
+                )
+            )
+            for temperature in CORRECTION_TEMPERATURES
+        ]
+        fallback = None
+        errors = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    candidate = await next_done
+                except Exception as e:
+                    logger.warning(f"Correction request failed: {e}")
+                    errors.append(e)
+                    continue
+                if candidate[1]:
+                    return candidate
+                if fallback is None:
+                    fallback = candidate
+        finally:
+            cancelled.set()
+            for task in tasks:
+                task.cancel()
+
+        if fallback is None:
+            raise errors[0]
+        return fallback
+
+    async def _acorrect_and_validate(
+        self,
+        strategy_code: str,
+        validation_error: str,
+        temperature: float,
+        cancelled: threading.Event,
+    ) -> Tuple[str, bool, str]:
+        """
+        Requests a correction of the code and validates it.
+
+        Args:
+            strategy_code (str): The Python code that failed validation.
+            validation_error (str): The validation error of the code.
+            temperature (float): The sampling temperature of the correction.
+            cancelled (threading.Event): Set once the correction is no longer needed.
+
+        Returns:
+            Tuple[str, bool, str]: The corrected code, whether it is valid, and its validation error.
+        """
+        corrected_code = await self.llm_interface.acorrect_strategy(
+            strategy_code, validation_error, temperature=temperature
+        )
+        is_valid, error = await asyncio.to_thread(
+            self.validate_code, corrected_code, cancelled
+        )
+        return corrected_code, is_valid, error
@@ -1,22 +1,35 @@
 import logging
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import backtrader as bt
 import pandas as pd
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+CSV_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
 class DataLoader:
     """
     A class responsible for loading financial data from CSV files into Backtrader feed format.
 
+    Parsed CSV files are cached on disk as pickles next to the data, and sliced
+    frames are kept in a bounded in-memory cache shared by all loaders.
+
     Attributes:
         data_directory (str): The directory where the CSV data files are located.
+        cache_directory (str): The directory where parsed data files are cached.
     """
 
+    MEMORY_CACHE_SIZE = 128
+    MAX_LOAD_WORKERS = 8
+    _slice_cache = OrderedDict()
+    _slice_cache_lock = threading.Lock()
+
     def __init__(self, data_directory: str):
         """
         Initializes the DataLoader with the given data directory.
@@ -27,6 +40,7 @@ class DataLoader:
         # Get the project root directory
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.data_directory = os.path.join(project_root, data_directory)
+        self.cache_directory = os.path.join(self.data_directory, "cache")
         logger.info(
             f"DataLoader initialized with data directory: {self.data_directory}"
         )
@@ -43,29 +57,47 @@ class DataLoader:
         Returns:
             list: A list of Backtrader data feeds for each asset.
         """
+        return [
+            self.create_feed(df)
+            for df in self.load_frames(assets, start_date, end_date)
+        ]
+
+    def load_frames(self, assets: list, start_date: str, end_date: str) -> list:
+        """
+        Loads the historical data for the given assets within the date range as DataFrames.
+
+        Args:
+            assets (list): List of asset names (e.g., ['AAPL', 'GOOG']) to load.
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
+
+        Returns:
+            list: A list of DataFrames for each asset.
+        """
         logger.info(
             f"Loading data for assets: {assets} from {start_date} to {end_date}"
         )
-        return [self._load_asset(asset, start_date, end_date) for asset in assets]
+        # CSV parsing releases the GIL, so assets are loaded concurrently
+        max_workers = max(1, min(len(assets), self.MAX_LOAD_WORKERS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda asset: self._load_asset(asset, start_date, end_date),
+                    assets,
+                )
+            )
 
-    def _load_asset(
-        self, asset: str, start_date: str, end_date: str
-    ) -> bt.feeds.PandasData:
+    @staticmethod
+    def create_feed(df: pd.DataFrame) -> bt.feeds.PandasData:
         """
-        Loads data for a single asset and converts it to a Backtrader PandasData feed.
+        Converts asset data to a Backtrader PandasData feed.
 
         Args:
-            asset (str): The name of the asset.
-            start_date (str): Start date in YYYY-MM-DD format.
-            end_date (str): End date in YYYY-MM-DD format.
+            df (pd.DataFrame): The asset data, indexed by datetime.
 
         Returns:
             bt.feeds.PandasData: The Backtrader data feed for the asset.
         """
-        logger.info(f"Loading data for asset: {asset}")
-        df = self._load_csv(asset)
-        df = df.loc[start_date:end_date]
-        logger.info(f"Data for asset {asset} loaded from {start_date} to {end_date}")
         return bt.feeds.PandasData(
             dataname=df,
             datetime=None,
@@ -78,15 +110,85 @@ class DataLoader:
             compression=60,
         )
 
-    def _load_csv(self, asset: str) -> pd.DataFrame:
+    def _load_asset(self, asset: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
-        Loads the CSV file for a given asset into a Pandas DataFrame.
+        Loads data for a single asset within the date range.
 
         Args:
-            asset (str): The name of the asset to load from CSV.
+            asset (str): The name of the asset.
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
 
         Returns:
-            pd.DataFrame: The loaded DataFrame containing asset data.
+            pd.DataFrame: The asset data within the date range.
+        """
+        logger.info(f"Loading data for asset: {asset}")
+        df = self._load_slice(asset, start_date, end_date)
+        logger.info(f"Data for asset {asset} loaded from {start_date} to {end_date}")
+        return df
+
+    def _load_slice(self, asset: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Returns the asset data within the date range, using the in-memory cache when possible.
+
+        Args:
+            asset (str): The name of the asset.
+            start_date (str): Start date in YYYY-MM-DD format.
+            end_date (str): End date in YYYY-MM-DD format.
+
+        Returns:
+            pd.DataFrame: The asset data within the date range.
+        """
+        file_path = self._get_file_path(asset)
+        # Dates may be strings or datetimes, both must map to the same entry
+        key = (
+            file_path,
+            os.path.getmtime(file_path),
+            pd.Timestamp(start_date),
+            pd.Timestamp(end_date),
+        )
+        cache = DataLoader._slice_cache
+        with DataLoader._slice_cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                logger.info(f"Using cached data for asset {asset}")
+                return cache[key]
+
+        df = self._slice_dates(self._load_csv(asset), start_date, end_date)
+        with DataLoader._slice_cache_lock:
+            cache[key] = df
+            if len(cache) > self.MEMORY_CACHE_SIZE:
+                cache.popitem(last=False)
+        return df
+
+    @staticmethod
+    def _slice_dates(df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+        """
+        Slices the data to the inclusive date range with a binary search on the
+        sorted index, avoiding label-based lookups.
+
+        Args:
+            df (pd.DataFrame): The asset data, sorted by its datetime index.
+            start_date (datetime): The start of the range.
+            end_date (datetime): The end of the range.
+
+        Returns:
+            pd.DataFrame: The asset data within the date range.
+        """
+        index = df.index.values
+        start = index.searchsorted(pd.Timestamp(start_date).to_datetime64(), "left")
+        end = index.searchsorted(pd.Timestamp(end_date).to_datetime64(), "right")
+        return df.iloc[start:end]
+
+    def _get_file_path(self, asset: str) -> str:
+        """
+        Returns the path of the CSV file for a given asset.
+
+        Args:
+            asset (str): The name of the asset.
+
+        Returns:
+            str: The path of the CSV file.
 
         Raises:
             FileNotFoundError: If the CSV file for the asset is not found.
@@ -95,9 +197,49 @@ class DataLoader:
         if not os.path.exists(file_path):
             logger.error(f"Data file for {asset} not found at {file_path}")
             raise FileNotFoundError(f"Data file for {asset} not found at {file_path}")
-        df = pd.read_csv(file_path, parse_dates=["datetime"], index_col="datetime")
+        return file_path
+
+    def _load_csv(self, asset: str) -> pd.DataFrame:
+        """
+        Loads the CSV file for a given asset into a Pandas DataFrame.
+        The parsed DataFrame is cached on disk and reused while it is newer than the CSV.
+
+        Args:
+            asset (str): The name of the asset to load from CSV.
+
+        Returns:
+            pd.DataFrame: The loaded DataFrame containing asset data.
+
+        Raises:
+            FileNotFoundError: If the CSV file for the asset is not found.
+        """
+        file_path = self._get_file_path(asset)
+        cache_path = os.path.join(self.cache_directory, f"{asset}_1h.pkl")
+        if os.path.exists(cache_path) and os.path.getmtime(
+            cache_path
+        ) >= os.path.getmtime(file_path):
+            try:
+                df = pd.read_pickle(cache_path)
+                logger.info(f"Cached data for {asset} loaded from {cache_path}")
+                return df
+            except Exception as e:
+                # A truncated pickle or one from another pandas version is rebuilt
+                logger.warning(f"Discarding unreadable cache {cache_path}: {e}")
+
+        df = pd.read_csv(
+            file_path,
+            parse_dates=["datetime"],
+            date_format=CSV_DATETIME_FORMAT,
+            index_col="datetime",
+        )
         logger.info(f"CSV file for {asset} loaded from {file_path}")
-        return df.sort_index()
+        df = df.sort_index()
+        # Write atomically, backtests running in parallel may load the same asset
+        os.makedirs(self.cache_directory, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+        return df
 
     def get_available_assets(self) -> list:
         """
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    A content-addressed cache for LLM responses, with a bounded in-memory tier
+    in front of a directory of JSON files.
+
+    Persisted responses expire after `max_age` seconds, and the directory is
+    pruned down to the `max_files` most recently written responses.
+
+    Attributes:
+        directory (str): The directory where responses are persisted.
+        max_size (int): The maximum number of responses kept in memory.
+        max_files (int): The maximum number of responses persisted on disk.
+        max_age (float): The number of seconds a response stays valid.
+    """
+
+    # Expired and surplus responses are deleted from disk once every this many writes
+    PRUNE_INTERVAL = 64
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = 1024,
+        max_files: int = 10000,
+        max_age: float = 60 * 60 * 24 * 7,
+    ):
+        """
+        Initializes the LLMCache.
+
+        Args:
+            directory (str): The directory where responses are persisted.
+            max_size (int): The maximum number of responses kept in memory. Default is 1024.
+            max_files (int): The maximum number of responses persisted on disk. Default is 10000.
+            max_age (float): The number of seconds a response stays valid. Default is a week.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_files = max_files
+        self.max_age = max_age
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def make_key(**request) -> str:
+        """
+        Computes the cache key of a request.
+
+        Args:
+            **request: The request fields that determine the response (model, messages, ...).
+
+        Returns:
+            str: The SHA-256 hex digest of the request.
+        """
+        payload = json.dumps(request, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str):
+        """
+        Returns the cached response for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: The cached response, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            if key in self._memory:
+                response, created = self._memory[key]
+                if now - created < self.max_age:
+                    self._memory.move_to_end(key)
+                    return response
+                del self._memory[key]
+
+        try:
+            with open(self._path(key)) as cache_file:
+                entry = json.load(cache_file)
+            response, created = entry["response"], entry["created"]
+        except (OSError, ValueError, KeyError):
+            return None
+        if now - created >= self.max_age:
+            return None
+        self._remember(key, response, created)
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Stores a response in both tiers.
+
+        Args:
+            key (str): The cache key.
+            response (str): The response to cache.
+        """
+        created = time.time()
+        self._remember(key, response, created)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as cache_file:
+                json.dump({"response": response, "created": created}, cache_file)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not persist LLM response: {e}")
+            return
+
+        with self._lock:
+            # Prune on the first write, then once every PRUNE_INTERVAL writes
+            prune = self._writes % self.PRUNE_INTERVAL == 0
+            self._writes += 1
+        if prune:
+            self.prune()
+
+    def prune(self) -> None:
+        """
+        Deletes expired responses from disk, then the oldest ones beyond `max_files`.
+        """
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(".json")
+            ]
+        except OSError:
+            return
+        entries.sort(key=self._mtime, reverse=True)
+        cutoff = time.time() - self.max_age
+        for index, entry in enumerate(entries):
+            if index >= self.max_files or self._mtime(entry) < cutoff:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _mtime(entry) -> float:
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def _remember(self, key: str, response: str, created: float) -> None:
+        with self._lock:
+            self._memory[key] = (response, created)
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
@@ -1,9 +1,21 @@
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import json
 import logging
+import os
+import random
 import re
+import string
+import threading
+from typing import Callable
 
+import aiohttp
 import openai
-import requests
+from decouple import config
 
+from backtester.utils.llm_cache import LLMCache
 from backtester.utils.prompt_templates import (
     STRATEGY_RELEVANCE_CHECK,
     STRATEGY_GENERATION,
@@ -11,13 +23,132 @@ from backtester.utils.prompt_templates import (
     STRATEGY_CORRECTION,
     CODE_GENERATOR_SYSTEM_MESSAGE,
     STRATEGY_DESCRIPTION,
+    STRATEGY_CLASSIFICATION_AND_DESCRIPTION,
     SYSTEM_MESSAGE_STRATEGY_DESCRIPTION,
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared by all LLMInterface instances, so identical prompts skip the API across sessions
+RESPONSE_CACHE = LLMCache(
+    os.path.join(os.path.expanduser("~"), ".cache", "backtester", "llm")
+)
+
+# Code in the LLM's output, either fenced or starting at the first line that looks like code
+_FENCE_RE = re.compile(r"```(?:python)?\n(.*?)```", re.DOTALL)
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\n(.*?)```", re.DOTALL)
+_CODE_START_RE = re.compile(r"^[ \t]*(?:import|from|class|def|#)", re.MULTILINE)
+
+# Prompts with MIN_RELEVANT_KEYWORDS distinct trading terms skip the LLM relevance check
+_RELEVANT_KEYWORDS_RE = re.compile(
+    r"\b(strateg(?:y|ies)|trad(?:e|es|ing)|buy|sell|long|short|indicators?|sma|ema|rsi"
+    r"|macd|bollinger|backtest(?:ing)?|portfolio|signals?|crossover|stop[- ]loss)\b",
+    re.IGNORECASE,
+)
+MIN_RELEVANT_KEYWORDS = 2
+
+# Output token budgets, strategies rarely need more and generation time scales with output
+STRATEGY_GENERATION_MAX_TOKENS = 350
+STRATEGY_CORRECTION_MAX_TOKENS = 400
+STRATEGY_DESCRIPTION_MAX_TOKENS = 120
+STRATEGY_RELEVANCE_MAX_TOKENS = 10
+STRATEGY_CLASSIFICATION_MAX_TOKENS = 200
+
+# Connections to the API are pooled and kept alive between requests, in one
+# session living on the interface's event loop
+HTTP_POOL_SIZE = 64
+KEEPALIVE_TIMEOUT = 75
+
+# Transient API errors are retried with exponential backoff and jitter
+MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.APIConnectionError,
+    openai.error.Timeout,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+    aiohttp.ClientConnectionError,
+)
+
+
+def _split_template(template: str) -> tuple:
+    """
+    Splits a `str.format` template into its literal text and field names once,
+    so prompts can be filled by concatenation instead of re-parsing the template.
+
+    Args:
+        template (str): The prompt template.
+
+    Returns:
+        tuple: Pairs of literal text (with braces unescaped) and the name of the
+            field that follows it, or None after the last literal.
+    """
+    return tuple(
+        (literal, field)
+        for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+
+def _fill_template(parts: tuple, **fields: str) -> str:
+    """
+    Fills a template split by `_split_template`.
+
+    Args:
+        parts (tuple): The split template.
+        **fields (str): The values of the template fields.
+
+    Returns:
+        str: The filled template, equal to `template.format(**fields)`.
+    """
+    return "".join(
+        literal + fields[field] if field is not None else literal
+        for literal, field in parts
+    )
+
+
+_RELEVANCE_CHECK_PARTS = _split_template(STRATEGY_RELEVANCE_CHECK)
+_GENERATION_PARTS = _split_template(STRATEGY_GENERATION)
+_MODIFICATION_PARTS = _split_template(STRATEGY_MODIFICATION)
+_CORRECTION_PARTS = _split_template(STRATEGY_CORRECTION)
+_DESCRIPTION_PARTS = _split_template(STRATEGY_DESCRIPTION)
+_CLASSIFICATION_PARTS = _split_template(STRATEGY_CLASSIFICATION_AND_DESCRIPTION)
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_interface() -> "LLMInterface":
+    """
+    Returns the process-wide LLMInterface, created on first use with the
+    OPENAI_API_KEY from the environment.
+
+    Returns:
+        LLMInterface: The shared LLM interface.
+
+    Raises:
+        ValueError: If the OPENAI_API_KEY is not found in the environment variables.
+    """
+    api_key = config("OPENAI_API_KEY", default="")
+    if not api_key:
+        logger.error("OPENAI_API_KEY not found in environment variables.")
+        raise ValueError("OPENAI_API_KEY not found in environment variables.")
+    return LLMInterface(api_key)
+
+
+def is_obviously_relevant(prompt: str) -> bool:
+    """
+    Checks locally whether a prompt is clearly about trading strategies.
+
+    Args:
+        prompt (str): The user-provided strategy prompt.
+
+    Returns:
+        bool: True if the prompt mentions enough distinct trading terms. False means
+            the relevance is undecided, not that the prompt is irrelevant.
+    """
+    keywords = {match.lower() for match in _RELEVANT_KEYWORDS_RE.findall(prompt)}
+    return len(keywords) >= MIN_RELEVANT_KEYWORDS
+
 
 def extract_code(output: str) -> str:
     """
@@ -30,26 +161,18 @@ def extract_code(output: str) -> str:
     Returns:
         str: The extracted Python code.
     """
-    logging.info("Extracting code from output.")
+    logger.info("Extracting code from output.")
 
     # Check if the output is wrapped in code block markers
-    code_block_match = re.search(r"```(?:python)?\n(.*?)```", output, re.DOTALL)
+    code_block_match = _FENCE_RE.search(output)
     if code_block_match:
-        logging.info("Code found within ``` blocks.")
+        logger.info("Code found within ``` blocks.")
         return code_block_match.group(1).strip()
 
-    # If no code block markers, extract lines that look like code
-    code_lines = []
-    recording = False
-    for line in output.split("\n"):
-        if (
-            line.strip().startswith(("import", "from", "class", "def", "#"))
-            or recording
-        ):
-            recording = True
-            code_lines.append(line)
-    extracted_code = "\n".join(code_lines)
-    logging.info("Code extracted without ``` blocks.")
+    # If no code block markers, extract everything from the first line that looks like code
+    code_start_match = _CODE_START_RE.search(output)
+    extracted_code = output[code_start_match.start() :] if code_start_match else ""
+    logger.info("Code extracted without ``` blocks.")
     return extracted_code
 
 
@@ -58,6 +181,9 @@ class LLMInterface:
     A class that interfaces with the OpenAI API to perform various tasks such as
     generating strategies, modifying them, checking relevance, and more.
 
+    Each task is implemented once, as an async method. The synchronous methods
+    run their async counterpart on the interface's event loop through `run`.
+
     Attributes:
         api_key (str): OpenAI API key for authentication.
     """
@@ -69,7 +195,11 @@ class LLMInterface:
         Args:
             api_key (str): The API key for accessing OpenAI services.
         """
-        openai.api_key = api_key
+        self.api_key = api_key
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._session = None
         logger.info(f"LLMInterface initialized with API key: {api_key[:5]}...")
 
     def generate_completion(
@@ -78,48 +208,437 @@ class LLMInterface:
         model: str = "gpt-4o",
         max_tokens: int = 500,
         system_message: str = None,
+        stream: bool = True,
+        on_token: Callable[[str], None] = None,
+        temperature: float = 0.3,
+        cache: bool = None,
     ) -> str:
         """
         Sends a prompt to the OpenAI API and returns the completion.
 
+        The response is streamed by default, so tokens can be consumed through
+        `on_token` as soon as they arrive. Deterministic responses are cached by
+        request content, so an identical request is answered without calling the API.
+
         Args:
             prompt (str): The prompt to send to the model.
             model (str): The model to use (default is 'gpt-4o').
             max_tokens (int): Maximum number of tokens for the response.
             system_message (str, optional): Optional system-level message for contextual guidance.
+            stream (bool): Whether to stream the response (default is True).
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of content.
+            temperature (float): Sampling temperature (default is 0.3).
+            cache (bool, optional): Whether to serve and store the response in the response cache.
+                Defaults to caching only deterministic (temperature 0) requests.
 
         Returns:
             str: The completion response from the API.
         """
-        logger.info(f"Sending prompt to LLM (model: {model}, max_tokens: {max_tokens})")
-        logger.debug(f"Prompt: {prompt}")
+        return self.run(
+            self.agenerate_completion(
+                prompt,
+                model=model,
+                max_tokens=max_tokens,
+                system_message=system_message,
+                stream=stream,
+                on_token=on_token,
+                temperature=temperature,
+                cache=cache,
+            )
+        )
 
-        messages = [{"role": "user", "content": prompt}]
-        if system_message:
-            messages.insert(0, {"role": "system", "content": system_message})
+    async def agenerate_completion(
+        self,
+        prompt: str,
+        model: str = "gpt-4o",
+        max_tokens: int = 500,
+        system_message: str = None,
+        stream: bool = True,
+        on_token: Callable[[str], None] = None,
+        temperature: float = 0.3,
+        cache: bool = None,
+    ) -> str:
+        """
+        Asynchronous version of `generate_completion`. Requests share the
+        connection pool of the interface's session when run through `submit` or `run`.
+
+        Args:
+            prompt (str): The prompt to send to the model.
+            model (str): The model to use (default is 'gpt-4o').
+            max_tokens (int): Maximum number of tokens for the response.
+            system_message (str, optional): Optional system-level message for contextual guidance.
+            stream (bool): Whether to stream the response (default is True).
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of content.
+            temperature (float): Sampling temperature (default is 0.3).
+            cache (bool, optional): Whether to serve and store the response in the response cache.
+                Defaults to caching only deterministic (temperature 0) requests.
+
+        Returns:
+            str: The completion response from the API.
+        """
+        logger.info(
+            f"Sending async prompt to LLM (model: {model}, max_tokens: {max_tokens}, stream: {stream})"
+        )
+        logger.debug("Prompt: %s", prompt)
+
+        messages = self._build_messages(prompt, system_message)
+
+        if cache is None:
+            # Sampled responses are meant to vary, caching would freeze them
+            cache = temperature == 0
+        cache_key = None
+        if cache:
+            cache_key = LLMCache.make_key(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+            cached = RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached LLM response.")
+                if on_token:
+                    on_token(cached)
+                return cached
 
         try:
-            response = openai.ChatCompletion.create(
-                model=model, messages=messages, temperature=0.3, max_tokens=max_tokens
+            response = await self._acall_openai(
+                api_key=self.api_key,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=stream,
             )
-            result = response.choices[0].message["content"]
+            if stream:
+                chunks = []
+                finish_reason = None
+                async for chunk in response:
+                    content = chunk.choices[0].delta.get("content", "")
+                    if content:
+                        chunks.append(content)
+                        if on_token:
+                            on_token(content)
+                    finish_reason = (
+                        chunk.choices[0].get("finish_reason") or finish_reason
+                    )
+                result = "".join(chunks)
+            else:
+                result = response.choices[0].message["content"]
+                finish_reason = response.choices[0].get("finish_reason")
+            if finish_reason == "length":
+                logger.warning(f"LLM response truncated at max_tokens={max_tokens}.")
+                # A retry should get a fresh response, not the truncated one again
+                cache_key = None
             logger.info("Received response from LLM.")
-            logger.debug(f"Response: {result}")
+            logger.debug("Response: %s", result)
+            if cache_key:
+                RESPONSE_CACHE.set(cache_key, result)
             return result
         except openai.error.OpenAIError as e:
             logger.error(f"OpenAI API error: {str(e)}")
             raise
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             logger.error(f"Network error: {str(e)}")
             raise
         except Exception as e:
-            logging.error(f"Unexpected error: {str(e)}")
+            logger.error(f"Unexpected error: {str(e)}")
             raise
 
+    @staticmethod
+    async def _acall_openai(**request):
+        """
+        Asynchronous version of `_call_openai`.
+
+        Args:
+            **request: The arguments of `openai.ChatCompletion.acreate`.
+
+        Returns:
+            The API response, or an async generator of chunks when streaming.
+
+        Raises:
+            openai.error.OpenAIError: If the error is not transient or all attempts failed.
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                return await openai.ChatCompletion.acreate(**request)
+            except Exception as e:
+                delay = LLMInterface._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int):
+        """
+        Computes how long to wait before retrying a failed request.
+
+        Args:
+            error (Exception): The error raised by the request.
+            attempt (int): The zero-based number of the failed attempt.
+
+        Returns:
+            float: The delay in seconds, or None if the request should not be retried.
+        """
+        is_server_error = isinstance(error, openai.error.APIError) and (
+            error.http_status or 0
+        ) >= 500
+        if not (isinstance(error, RETRYABLE_ERRORS) or is_server_error):
+            return None
+        if attempt + 1 >= MAX_ATTEMPTS:
+            return None
+        delay = min(
+            RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt * (1 + random.random())
+        )
+        logger.warning(
+            f"Attempt {attempt + 1}/{MAX_ATTEMPTS} failed ({type(error).__name__}: {error}), "
+            f"retrying in {delay:.1f}s."
+        )
+        return delay
+
+    def submit(self, coroutine) -> concurrent.futures.Future:
+        """
+        Schedules a coroutine, usually one of the async methods, on the
+        interface's event loop.
+
+        The loop runs for the lifetime of the interface in a background thread,
+        so all requests share one HTTP session and its kept-alive connections,
+        whichever thread submitted them.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the result of the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._in_session(coroutine), self._get_loop()
+        )
+
+    def run(self, coroutine):
+        """
+        Runs a coroutine on the interface's event loop and waits for its result.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            The result of the coroutine.
+
+        Raises:
+            RuntimeError: If called from the event loop itself, which would deadlock.
+        """
+        if threading.current_thread() is self._loop_thread:
+            coroutine.close()
+            raise RuntimeError("run() cannot be called from the LLM event loop.")
+        return self.submit(coroutine).result()
+
+    def close(self):
+        """
+        Closes the HTTP session and stops the event loop, if they were started.
+        """
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close_session(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join()
+        loop.close()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Returns the interface's event loop, starting its thread on first use.
+
+        Returns:
+            asyncio.AbstractEventLoop: The running event loop.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="llm-loop", daemon=True
+                )
+                self._loop_thread.start()
+                atexit.register(self.close)
+            return self._loop
+
+    async def _in_session(self, coroutine):
+        """
+        Awaits a coroutine with its requests made through the shared HTTP session.
+        Only runs on the interface's event loop, which owns the session.
+
+        Args:
+            coroutine: The coroutine to await.
+
+        Returns:
+            The result of the coroutine.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE, keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        token = openai.aiosession.set(self._session)
+        try:
+            return await coroutine
+        finally:
+            openai.aiosession.reset(token)
+
+    async def _close_session(self):
+        """
+        Closes the shared HTTP session.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _build_messages(prompt: str, system_message: str = None) -> list:
+        """
+        Builds the chat messages for a prompt.
+
+        Args:
+            prompt (str): The prompt to send to the model.
+            system_message (str, optional): Optional system-level message for contextual guidance.
+
+        Returns:
+            list: The chat messages.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if system_message:
+            messages.insert(0, {"role": "system", "content": system_message})
+        return messages
+
     def check_strategy_relevance(self, prompt: str) -> bool:
         """
         Checks the relevance of a given strategy prompt.
 
+        Args:
+            prompt (str): The user-provided strategy prompt.
+
+        Returns:
+            bool: True if the strategy is relevant, otherwise False.
+        """
+        return self.run(self.acheck_strategy_relevance(prompt))
+
+    def generate_strategy(
+        self, user_input: str, on_token: Callable[[str], None] = None
+    ) -> str:
+        """
+        Generates a strategy based on the user's input.
+
+        Args:
+            user_input (str): The input provided by the user.
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of the response.
+
+        Returns:
+            str: The generated strategy code.
+        """
+        return self.run(self.agenerate_strategy(user_input, on_token=on_token))
+
+    def modify_strategy(
+        self,
+        current_strategy: str,
+        modification_prompt: str,
+        on_token: Callable[[str], None] = None,
+    ) -> str:
+        """
+        Modifies an existing strategy based on the modification prompt.
+
+        Args:
+            current_strategy (str): The current strategy code.
+            modification_prompt (str): The modifications the user wants.
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of the response.
+
+        Returns:
+            str: The modified strategy code.
+        """
+        return self.run(
+            self.amodify_strategy(
+                current_strategy, modification_prompt, on_token=on_token
+            )
+        )
+
+    def correct_strategy(
+        self, strategy_code: str, error_message: str, temperature: float = 0.3
+    ) -> str:
+        """
+        Corrects a strategy based on an error message.
+
+        Args:
+            strategy_code (str): The original strategy code.
+            error_message (str): The error message that needs to be fixed.
+            temperature (float): Sampling temperature (default is 0.3).
+
+        Returns:
+            str: The corrected strategy code.
+        """
+        return self.run(
+            self.acorrect_strategy(strategy_code, error_message, temperature=temperature)
+        )
+
+    def describe_strategy(self, strategy_code: str) -> str:
+        """
+        Provides a description of the given strategy code.
+
+        Args:
+            strategy_code (str): The code of the strategy to describe.
+
+        Returns:
+            str: A description of the strategy.
+        """
+        return self.run(self.adescribe_strategy(strategy_code))
+
+    def classify_and_describe(
+        self, user_input: str, strategy_code: str
+    ) -> tuple[bool, str]:
+        """
+        Checks the relevance of a prompt and describes the strategy generated from it
+        in a single request. Prompts that are obviously relevant only get described.
+
+        Falls back to `check_strategy_relevance` and `describe_strategy` if the
+        response cannot be parsed.
+
+        Args:
+            user_input (str): The user-provided strategy prompt.
+            strategy_code (str): The code of the strategy to describe.
+
+        Returns:
+            tuple[bool, str]: Whether the prompt is relevant, and a description of the strategy.
+        """
+        return self.run(self.aclassify_and_describe(user_input, strategy_code))
+
+    @staticmethod
+    def _parse_classification(response: str) -> tuple[bool, str]:
+        """
+        Parses the JSON response of a classification and description request.
+
+        Args:
+            response (str): The response from the model.
+
+        Returns:
+            tuple[bool, str]: Whether the prompt is relevant, and a description of the strategy.
+
+        Raises:
+            ValueError: If the response is not a JSON object with both fields.
+        """
+        text = response.strip()
+        code_block_match = _JSON_FENCE_RE.search(text)
+        if code_block_match:
+            text = code_block_match.group(1)
+        try:
+            classification = json.loads(text)
+            relevant = classification["relevant"]
+            description = classification["description"]
+        except (ValueError, TypeError, KeyError):
+            raise ValueError(f"Could not parse classification response: {response!r}.")
+        return str(relevant).strip().lower() == "yes", str(description).strip()
+
+    async def acheck_strategy_relevance(self, prompt: str) -> bool:
+        """
+        Asynchronous version of `check_strategy_relevance`.
+
         Args:
             prompt (str): The user-provided strategy prompt.
 
@@ -127,76 +646,109 @@ class LLMInterface:
             bool: True if the strategy is relevant, otherwise False.
         """
         logger.info("Checking strategy relevance for prompt.")
-        check_prompt = STRATEGY_RELEVANCE_CHECK.format(prompt=prompt)
-        response = self.generate_completion(check_prompt, max_tokens=10)
+        if is_obviously_relevant(prompt):
+            logger.info("Strategy relevance: True (keyword match)")
+            return True
+        check_prompt = _fill_template(_RELEVANCE_CHECK_PARTS, prompt=prompt)
+        response = await self.agenerate_completion(
+            check_prompt,
+            max_tokens=STRATEGY_RELEVANCE_MAX_TOKENS,
+            stream=False,
+            temperature=0,
+        )
         is_relevant = response.strip().lower() == "yes"
         logger.info(f"Strategy relevance: {is_relevant}")
         return is_relevant
 
-    def generate_strategy(self, user_input: str) -> str:
+    async def agenerate_strategy(
+        self, user_input: str, on_token: Callable[[str], None] = None
+    ) -> str:
         """
-        Generates a strategy based on the user's input.
+        Asynchronous version of `generate_strategy`.
 
         Args:
             user_input (str): The input provided by the user.
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of the response.
 
         Returns:
             str: The generated strategy code.
         """
         logger.info("Generating strategy for user input.")
-        strategy_prompt = STRATEGY_GENERATION.format(user_input=user_input)
-        raw_output = self.generate_completion(
-            strategy_prompt, system_message=CODE_GENERATOR_SYSTEM_MESSAGE
+        strategy_prompt = _fill_template(_GENERATION_PARTS, user_input=user_input)
+        raw_output = await self.agenerate_completion(
+            strategy_prompt,
+            max_tokens=STRATEGY_GENERATION_MAX_TOKENS,
+            system_message=CODE_GENERATOR_SYSTEM_MESSAGE,
+            on_token=on_token,
         )
         code = extract_code(raw_output)
         logger.info("Strategy generated successfully.")
         return code
 
-    def modify_strategy(self, current_strategy: str, modification_prompt: str) -> str:
+    async def amodify_strategy(
+        self,
+        current_strategy: str,
+        modification_prompt: str,
+        on_token: Callable[[str], None] = None,
+    ) -> str:
         """
-        Modifies an existing strategy based on the modification prompt.
+        Asynchronous version of `modify_strategy`.
 
         Args:
             current_strategy (str): The current strategy code.
             modification_prompt (str): The modifications the user wants.
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of the response.
 
         Returns:
             str: The modified strategy code.
         """
         logger.info("Modifying strategy.")
-        full_prompt = STRATEGY_MODIFICATION.format(
-            current_strategy=current_strategy, modification_prompt=modification_prompt
+        full_prompt = _fill_template(
+            _MODIFICATION_PARTS,
+            current_strategy=current_strategy,
+            modification_prompt=modification_prompt,
         )
-        raw_output = self.generate_completion(
-            full_prompt, system_message=CODE_GENERATOR_SYSTEM_MESSAGE
+        raw_output = await self.agenerate_completion(
+            full_prompt,
+            max_tokens=STRATEGY_GENERATION_MAX_TOKENS,
+            system_message=CODE_GENERATOR_SYSTEM_MESSAGE,
+            on_token=on_token,
         )
         modified_code = extract_code(raw_output)
         logger.info("Strategy modified successfully.")
         return modified_code
 
-    def correct_strategy(self, strategy_code: str, error_message: str) -> str:
+    async def acorrect_strategy(
+        self, strategy_code: str, error_message: str, temperature: float = 0.3
+    ) -> str:
         """
-        Corrects a strategy based on an error message.
+        Asynchronous version of `correct_strategy`.
 
         Args:
             strategy_code (str): The original strategy code.
             error_message (str): The error message that needs to be fixed.
+            temperature (float): Sampling temperature (default is 0.3).
 
         Returns:
             str: The corrected strategy code.
         """
         logger.info("Correcting strategy based on error.")
-        correction_prompt = STRATEGY_CORRECTION.format(
-            strategy_code=strategy_code, error_message=error_message
+        correction_prompt = _fill_template(
+            _CORRECTION_PARTS, strategy_code=strategy_code, error_message=error_message
+        )
+        raw_output = await self.agenerate_completion(
+            correction_prompt,
+            max_tokens=STRATEGY_CORRECTION_MAX_TOKENS,
+            temperature=temperature,
+            cache=False,
         )
-        raw_output = self.generate_completion(correction_prompt)
         corrected_code = extract_code(raw_output)
         logger.info("Strategy corrected successfully.")
         return corrected_code
 
-    def describe_strategy(self, strategy_code: str) -> str:
+    async def adescribe_strategy(self, strategy_code: str) -> str:
         """
-        Provides a description of the given strategy code.
+        Asynchronous version of `describe_strategy`.
 
         Args:
             strategy_code (str): The code of the strategy to describe.
@@ -205,11 +757,53 @@ class LLMInterface:
             str: A description of the strategy.
         """
         logger.info("Describing strategy.")
-        description_prompt = STRATEGY_DESCRIPTION.format(strategy_code=strategy_code)
-        description = self.generate_completion(
+        description_prompt = _fill_template(
+            _DESCRIPTION_PARTS, strategy_code=strategy_code
+        )
+        description = await self.agenerate_completion(
             description_prompt,
-            max_tokens=150,
+            max_tokens=STRATEGY_DESCRIPTION_MAX_TOKENS,
             system_message=SYSTEM_MESSAGE_STRATEGY_DESCRIPTION,
+            temperature=0,
         )
         logger.info("Strategy description generated successfully.")
         return description
+
+    async def aclassify_and_describe(
+        self, user_input: str, strategy_code: str
+    ) -> tuple[bool, str]:
+        """
+        Asynchronous version of `classify_and_describe`.
+
+        Args:
+            user_input (str): The user-provided strategy prompt.
+            strategy_code (str): The code of the strategy to describe.
+
+        Returns:
+            tuple[bool, str]: Whether the prompt is relevant, and a description of the strategy.
+        """
+        logger.info("Classifying prompt and describing strategy.")
+        if is_obviously_relevant(user_input):
+            logger.info("Strategy relevance: True (keyword match)")
+            return True, await self.adescribe_strategy(strategy_code)
+        classification_prompt = _fill_template(
+            _CLASSIFICATION_PARTS, user_input=user_input, strategy_code=strategy_code
+        )
+        response = await self.agenerate_completion(
+            classification_prompt,
+            max_tokens=STRATEGY_CLASSIFICATION_MAX_TOKENS,
+            system_message=SYSTEM_MESSAGE_STRATEGY_DESCRIPTION,
+            stream=False,
+            temperature=0,
+        )
+        try:
+            is_relevant, description = self._parse_classification(response)
+        except ValueError as e:
+            logger.warning(f"{e} Falling back to separate requests.")
+            is_relevant, description = await asyncio.gather(
+                self.acheck_strategy_relevance(user_input),
+                self.adescribe_strategy(strategy_code),
+            )
+            return is_relevant, description
+        logger.info(f"Strategy relevance: {is_relevant}")
+        return is_relevant, description
@@ -1,12 +1,38 @@
 import logging
+from operator import itemgetter
 
 import numpy as np
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+METRIC_FIELDS = (
+    "final_portfolio_value",
+    "sharpe_ratio",
+    "max_drawdown",
+    "total_return",
+)
+TRADE_ANALYSIS_FIELDS = (
+    "total_trades",
+    "winning_trades",
+    "losing_trades",
+    "win_rate",
+    "avg_trade",
+    "avg_win",
+    "avg_loss",
+    "largest_win",
+    "largest_loss",
+    "avg_trade_length",
+    "profit_factor",
+)
+# Column order of the results matrix, one row per result
+RESULT_FIELDS = METRIC_FIELDS + TRADE_ANALYSIS_FIELDS
+
+# Fetch all fields of a result in one call each
+_get_metric_values = itemgetter(*METRIC_FIELDS)
+_get_trade_analysis_values = itemgetter(*TRADE_ANALYSIS_FIELDS)
+
+
 class Metrics:
     """
     A utility class for calculating financial metrics from backtesting results,
@@ -58,7 +84,6 @@ class Metrics:
         logger.info(f"Total return: {total_return}")
 
         trade_analysis = result.analyzers.trades.get_analysis()
-        logger.info(f"Trade analysis: {trade_analysis}")
 
         metrics = {
             "final_portfolio_value": portfolio_value,
@@ -85,40 +110,41 @@ class Metrics:
         individual_results = [
             Metrics._calculate_single(result[0]) for result in results
         ]
+        return Metrics.aggregate(individual_results)
 
-        def safe_mean(values):
-            valid_values = [v for v in values if v is not None]
-            return np.mean(valid_values) if valid_values else None
-
-        avg_metrics = {
-            "final_portfolio_value": safe_mean(
-                [r["final_portfolio_value"] for r in individual_results]
-            ),
-            "sharpe_ratio": safe_mean([r["sharpe_ratio"] for r in individual_results]),
-            "max_drawdown": safe_mean([r["max_drawdown"] for r in individual_results]),
-            "total_return": safe_mean([r["total_return"] for r in individual_results]),
-        }
+    @staticmethod
+    def aggregate(individual_results):
+        """
+        Compute the average metrics across already calculated individual metrics.
 
-        trade_analyses = [r["trade_analysis"] for r in individual_results]
-        avg_trade_analysis = {
-            "total_trades": safe_mean([ta["total_trades"] for ta in trade_analyses]),
-            "winning_trades": safe_mean(
-                [ta["winning_trades"] for ta in trade_analyses]
-            ),
-            "losing_trades": safe_mean([ta["losing_trades"] for ta in trade_analyses]),
-            "win_rate": safe_mean([ta["win_rate"] for ta in trade_analyses]),
-            "avg_trade": safe_mean([ta["avg_trade"] for ta in trade_analyses]),
-            "avg_win": safe_mean([ta["avg_win"] for ta in trade_analyses]),
-            "avg_loss": safe_mean([ta["avg_loss"] for ta in trade_analyses]),
-            "largest_win": safe_mean([ta["largest_win"] for ta in trade_analyses]),
-            "largest_loss": safe_mean([ta["largest_loss"] for ta in trade_analyses]),
-            "avg_trade_length": safe_mean(
-                [ta["avg_trade_length"] for ta in trade_analyses]
-            ),
-            "profit_factor": safe_mean([ta["profit_factor"] for ta in trade_analyses]),
-        }
+        Args:
+            individual_results (list): A list of metric dicts as returned by `_calculate_single`.
 
-        avg_metrics["trade_analysis"] = avg_trade_analysis
+        Returns:
+            dict: A dictionary containing both individual metrics for each result and averaged metrics across results.
+        """
+        values = np.array(
+            [Metrics._to_row(result) for result in individual_results],
+            dtype=np.float64,
+        ).reshape(-1, len(RESULT_FIELDS))
+
+        # NaN-aware column means in one pass, None where a metric is missing in every result
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
+        means = np.nansum(values, axis=0) / np.maximum(counts, 1)
+        averages = dict(
+            zip(
+                RESULT_FIELDS,
+                (
+                    float(mean) if count else None
+                    for mean, count in zip(means, counts)
+                ),
+            )
+        )
+
+        avg_metrics = {name: averages[name] for name in METRIC_FIELDS}
+        avg_metrics["trade_analysis"] = {
+            name: averages[name] for name in TRADE_ANALYSIS_FIELDS
+        }
 
         logger.info("Average metrics calculated.")
         return {
@@ -126,6 +152,22 @@ class Metrics:
             "average_metrics": avg_metrics,
         }
 
+    @staticmethod
+    def _to_row(metrics):
+        """
+        Flatten the metrics of a single result into a row ordered by RESULT_FIELDS.
+
+        Args:
+            metrics (dict): The metrics as returned by `_calculate_single`.
+
+        Returns:
+            list: The metric values, with NaN for missing values.
+        """
+        values = _get_metric_values(metrics) + _get_trade_analysis_values(
+            metrics["trade_analysis"]
+        )
+        return [np.nan if value is None else value for value in values]
+
     @staticmethod
     def _process_trade_analysis(trade_analysis):
         """
@@ -156,18 +198,24 @@ class Metrics:
                 "profit_factor": 0,
             }
 
-        winning_trades = trade_analysis.won.total
-        losing_trades = trade_analysis.lost.total
-        win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
+        # Bind the analysis nodes once, each attribute access walks an AutoOrderedDict
+        won = trade_analysis.won
+        lost = trade_analysis.lost
+        won_pnl = won.pnl
+        lost_pnl = lost.pnl
+
+        winning_trades = won.total
+        losing_trades = lost.total
+        win_rate = (winning_trades / total_trades) * 100
         avg_trade = trade_analysis.pnl.net.average
-        avg_win = trade_analysis.won.pnl.average if winning_trades > 0 else 0
-        avg_loss = trade_analysis.lost.pnl.average if losing_trades > 0 else 0
-        largest_win = trade_analysis.won.pnl.max if winning_trades > 0 else 0
-        largest_loss = trade_analysis.lost.pnl.max if losing_trades > 0 else 0
+        avg_win = won_pnl.average if winning_trades > 0 else 0
+        avg_loss = lost_pnl.average if losing_trades > 0 else 0
+        largest_win = won_pnl.max if winning_trades > 0 else 0
+        largest_loss = lost_pnl.max if losing_trades > 0 else 0
         avg_trade_length = trade_analysis.len.average
 
-        gross_profits = trade_analysis.won.pnl.total if winning_trades > 0 else 0
-        gross_losses = abs(trade_analysis.lost.pnl.total) if losing_trades > 0 else 0
+        gross_profits = won_pnl.total if winning_trades > 0 else 0
+        gross_losses = abs(lost_pnl.total) if losing_trades > 0 else 0
         profit_factor = (
             gross_profits / gross_losses if gross_losses != 0 else float("inf")
         )
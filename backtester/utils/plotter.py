@@ -1,13 +1,19 @@
+import functools
 import logging
 import os
 
-from backtrader_plotting import Bokeh
-from backtrader_plotting.schemes import Blackly
-
-# Configure logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PLOT_DIRECTORY = "plots"
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_plot_directory():
+    """
+    Creates the plots directory the first time a plot is saved.
+    """
+    os.makedirs(PLOT_DIRECTORY, exist_ok=True)
+
 
 def generate_and_save_plot(cerebro, filename):
     """
@@ -22,10 +28,13 @@ def generate_and_save_plot(cerebro, filename):
     """
     logger.info("Generating interactive Bokeh plot...")
 
-    # Create a 'plots' directory if it doesn't exist
-    os.makedirs("plots", exist_ok=True)
+    _ensure_plot_directory()
+
+    plot_path = os.path.join(PLOT_DIRECTORY, filename)
 
-    plot_path = os.path.join("plots", filename)
+    # Imported here, the Bokeh stack is only needed by processes that plot
+    from backtrader_plotting import Bokeh
+    from backtrader_plotting.schemes import Blackly
 
     # Create a Bokeh object with desired settings, including filename
     b = Bokeh(
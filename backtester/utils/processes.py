@@ -0,0 +1,8 @@
+import multiprocessing
+
+# Forking the multithreaded server could hand a child process locks held by
+# other threads, so child processes are forked from a single-threaded server
+# instead. It preloads the backtesting stack, which both backtests and the
+# strategy code run in the validation sandbox import.
+FORKSERVER_CONTEXT = multiprocessing.get_context("forkserver")
+FORKSERVER_CONTEXT.set_forkserver_preload(["backtester.utils.backtester"])
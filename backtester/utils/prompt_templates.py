@@ -5,10 +5,11 @@ Answer with only 'Yes' or 'No'.
 Prompt: {prompt}
 """
 
-STRATEGY_GENERATION = """
-Generate a Python trading strategy class using Backtrader named `MyStrategy` based on the following description:
+# Templates keep their fixed instructions first and the user-supplied fields last,
+# so the prompt prefix is identical across requests and can be cached by the provider.
 
-{user_input}
+STRATEGY_GENERATION = """
+Generate a Python trading strategy class using Backtrader named `MyStrategy` based on the description given below.
 
 The code should:
 
@@ -39,17 +40,15 @@ Only respond with the code, no additional text, and do not include any introduct
 The lookahead bias is a common issue in backtesting, be aware of that.
 To fix this, we need to use the previous candle's high and low for our calculations.
 Always only use indicators that are part of the Backtrader library or ta-lib.
+
+Description:
+{user_input}
+
 Begin your response now.
 """
 
 STRATEGY_MODIFICATION = """
-Modify the following Python strategy code according to this request:
-
-Modification request:
-{modification_prompt}
-
-Original code:
-{current_strategy}
+Modify the Python strategy code given below according to the modification request.
 
 The modified code should:
 
@@ -62,18 +61,25 @@ Only respond with the code, no additional text, and do not include any introduct
 The lookahead bias is a common issue in backtesting, be aware of that.
 To fix this, we need to use the previous candle's high and low for our calculations.
 Always only use indicators that are part of the Backtrader library or ta-lib.
+
+Original code:
+{current_strategy}
+
+Modification request:
+{modification_prompt}
+
 Begin your response now.
 """
 
 STRATEGY_CORRECTION = """
-The following strategy code has a compilation error:
+The strategy code given below has a compilation error.
+
+Is it possible that you are using indicators that are not part of the Backtrader library? If so please use only Backtrader indicators or create your own. Available backtrader indicators are:
+Please correct the error and provide only the corrected code. Ensure all necessary imports are included and that the code follows Backtrader's structure for strategies.
 
 {strategy_code}
 
 Compilation error: {error_message}
-
-Is it possible that you are using indicators that are not part of the Backtrader library? If so please use only Backtrader indicators or create your own. Available backtrader indicators are:
-Please correct the error and provide only the corrected code. Ensure all necessary imports are included and that the code follows Backtrader's structure for strategies.
 """
 
 STRATEGY_DESCRIPTION = """
@@ -85,6 +91,21 @@ describe the following strategy:
 {strategy_code}
 """
 
+STRATEGY_CLASSIFICATION_AND_DESCRIPTION = """
+Answer two questions about the request and the trading strategy code below.
+
+1. Is the request related to creating or modifying a trading strategy? Answer with only 'Yes' or 'No'.
+2. Provide a concise, clear, and simple natural language description of the trading strategy defined in the code. Focus on summarizing the strategy's behavior and actions in the market from the perspective of a trader. Do not include any code snippets, variable names, or explanations about the code structure or implementation details. The description should be no longer than a few sentences.
+
+Respond with only a JSON object, without code indicators, in the following format:
+{{"relevant": "Yes", "description": "Buy when the 10-period SMA crosses above the 20-period SMA. Sell when the 10-period SMA crosses below the 20-period SMA."}}
+
+Request: {user_input}
+
+Strategy code:
+{strategy_code}
+"""
+
 SYSTEM_MESSAGE_STRATEGY_DESCRIPTION = "You are a financial analyst who describes trading strategies in simple terms."
 
 CODE_GENERATOR_SYSTEM_MESSAGE = "You are an AI language model that generates only code based on user requests. You do not provide explanations or additional text. All outputs should be code-only."
@@ -0,0 +1,106 @@
+import gc
+import logging
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class SharedFrame:
+    """
+    A picklable handle to a numeric DataFrame placed in shared memory, so worker
+    processes can read it without the DataFrame being pickled for each of them.
+
+    The shared block holds the datetime index as int64 nanoseconds followed by the
+    values as a C-contiguous float64 matrix.
+
+    Attributes:
+        name (str): The name of the shared memory block.
+        shape (tuple): The shape of the values matrix.
+        columns (list): The column names of the DataFrame.
+        index_name (str): The name of the DataFrame index.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Copies the DataFrame into a new shared memory block.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to share, with a DatetimeIndex and numeric columns.
+        """
+        index = df.index.asi8
+        values = df.to_numpy(np.float64)
+        self.shape = values.shape
+        self.columns = list(df.columns)
+        self.index_name = df.index.name
+        # Zero-sized blocks are not allowed
+        self._shm = SharedMemory(create=True, size=max(1, index.nbytes + values.nbytes))
+        self.name = self._shm.name
+        index_view, values_view = self._views(self._shm.buf)
+        index_view[:] = index
+        values_view[:] = values
+        logger.info(f"Shared {values.nbytes + index.nbytes} bytes in {self.name}")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shm"] = None
+        return state
+
+    def _views(self, buffer):
+        """
+        Returns the index and values arrays backed by the given buffer.
+
+        Args:
+            buffer (memoryview): The buffer of the shared memory block.
+
+        Returns:
+            tuple: The int64 index array and the float64 values matrix.
+        """
+        rows = self.shape[0]
+        index = np.ndarray((rows,), dtype=np.int64, buffer=buffer)
+        values = np.ndarray(self.shape, dtype=np.float64, buffer=buffer, offset=index.nbytes)
+        return index, values
+
+    def apply(self, func, *args):
+        """
+        Attaches to the shared memory block and calls `func(df, *args)` with a
+        zero-copy DataFrame over it. The DataFrame must not outlive the call.
+
+        Args:
+            func (callable): The function to call with the DataFrame.
+            *args: Additional positional arguments for the function.
+
+        Returns:
+            The return value of the function.
+        """
+        shm = SharedMemory(name=self.name)
+        try:
+            index, values = self._views(shm.buf)
+            df = pd.DataFrame(
+                values,
+                index=pd.DatetimeIndex(index.view("datetime64[ns]"), name=self.index_name),
+                columns=self.columns,
+                copy=False,
+            )
+            del index, values
+            return func(df, *args)
+        finally:
+            df = None
+            # Backtrader objects keep the frame alive through reference cycles,
+            # the buffer can only be released once they are collected
+            gc.collect()
+            try:
+                shm.close()
+            except BufferError:
+                logger.warning(f"Shared memory {self.name} is still referenced.")
+
+    def unlink(self):
+        """
+        Releases the shared memory block. Only called by the process that created it.
+        """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
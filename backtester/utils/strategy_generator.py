@@ -1,14 +1,37 @@
+import contextvars
+import functools
+import hashlib
 import logging
+import queue
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterator, Union
 
-from decouple import config
+from .code_validator import get_code_validator
+from .llm_interface import get_llm_interface
 
-from .code_validator import CodeValidator
-from .llm_interface import LLMInterface
-
-# Configure logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The description of the strategy last generated or modified in the current
+# thread, or in the current task on the LLM event loop
+_current_strategy_description = contextvars.ContextVar(
+    "current_strategy_description", default=None
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_strategy_generator() -> "StrategyGenerator":
+    """
+    Returns the process-wide StrategyGenerator, created on first use.
+
+    Returns:
+        StrategyGenerator: The shared strategy generator.
+
+    Raises:
+        ValueError: If the OPENAI_API_KEY is not found in the environment variables.
+    """
+    return StrategyGenerator()
+
 
 class StrategyGenerator:
     """
@@ -17,26 +40,34 @@ class StrategyGenerator:
     Attributes:
         llm_interface (LLMInterface): Interface for interacting with the language model.
         code_validator (CodeValidator): Validator for checking and correcting strategy code.
-        current_strategy_description (str): Description of the current trading strategy.
+        current_strategy_description (str): Description of the current trading strategy,
+            kept per thread (or task) since one generator serves concurrent requests.
     """
 
+    VALIDATION_CACHE_SIZE = 256
+
     def __init__(self):
         """
-        Initializes the StrategyGenerator, loading environment variables and
-        initializing the LLMInterface and CodeValidator.
+        Initializes the StrategyGenerator with the shared LLMInterface and CodeValidator.
 
         Raises:
             ValueError: If the OPENAI_API_KEY is not found in the environment variables.
         """
-        # Initialize LLMInterface
-        api_key = config("OPENAI_API_KEY")
-        if not api_key:
-            logger.error("OPENAI_API_KEY not found in environment variables.")
-            raise ValueError("OPENAI_API_KEY not found in environment variables.")
+        self.llm_interface = get_llm_interface()
+        self.code_validator = get_code_validator()
+        self._validation_cache = OrderedDict()
+        self._validation_cache_lock = threading.Lock()
+
+    @property
+    def current_strategy_description(self) -> str:
+        """
+        The description of the strategy last generated or modified by the current thread.
+        """
+        return _current_strategy_description.get()
 
-        self.llm_interface = LLMInterface(api_key)
-        self.code_validator = CodeValidator(self.llm_interface)
-        self.current_strategy_description = None
+    @current_strategy_description.setter
+    def current_strategy_description(self, description: str):
+        _current_strategy_description.set(description)
 
     def generate_strategy(self, user_input: str) -> tuple[str, dict]:
         """
@@ -51,19 +82,38 @@ class StrategyGenerator:
         Raises:
             ValueError: If the user input is not related to creating a trading strategy.
         """
-        if not self.llm_interface.check_strategy_relevance(user_input):
-            logger.error(
-                "The provided prompt is not related to creating a trading strategy."
-            )
-            raise ValueError(
-                "The provided prompt is not related to creating a trading strategy."
-            )
+        return self._run(self.agenerate_strategy(user_input))
 
-        strategy_code = self.llm_interface.generate_strategy(user_input)
-        validated_code, parameters = self.code_validator.check_and_correct_strategy(
-            strategy_code
+    async def agenerate_strategy(
+        self, user_input: str, on_token: Callable[[str], None] = None
+    ) -> tuple[str, dict]:
+        """
+        Asynchronous version of `generate_strategy`. The relevance of the prompt
+        is checked in the same request that describes the generated strategy.
+
+        Args:
+            user_input (str): The user's prompt for generating a strategy.
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of the generated code.
+
+        Returns:
+            tuple[str, dict]: A tuple containing the validated strategy code and its parameters.
+
+        Raises:
+            ValueError: If the user input is not related to creating a trading strategy.
+        """
+        strategy_code = await self.llm_interface.agenerate_strategy(
+            user_input, on_token=on_token
+        )
+        description = await self._aclassify_and_describe(
+            user_input,
+            strategy_code,
+            "The provided prompt is not related to creating a trading strategy.",
+        )
+        validated_code, parameters = await self._avalidate_strategy(strategy_code)
+        await self._aupdate_strategy_description(
+            validated_code,
+            description if validated_code == strategy_code else None,
         )
-        self._update_strategy_description(validated_code)
         logger.info("Successfully generated strategy.")
         return validated_code, parameters
 
@@ -83,24 +133,172 @@ class StrategyGenerator:
         Raises:
             ValueError: If the modification prompt is not related to modifying a trading strategy.
         """
-        if not self.llm_interface.check_strategy_relevance(modification_prompt):
-            logger.error(
-                "The provided prompt is not related to modifying a trading strategy."
-            )
-            raise ValueError(
-                "The provided prompt is not related to modifying a trading strategy."
-            )
+        return self._run(self.amodify_strategy(current_strategy, modification_prompt))
+
+    async def amodify_strategy(
+        self,
+        current_strategy: str,
+        modification_prompt: str,
+        on_token: Callable[[str], None] = None,
+    ) -> tuple[str, dict]:
+        """
+        Asynchronous version of `modify_strategy`. The relevance of the prompt
+        is checked in the same request that describes the modified strategy.
+
+        Args:
+            current_strategy (str): The current trading strategy code.
+            modification_prompt (str): The user's prompt for modifying the strategy.
+            on_token (Callable[[str], None], optional): Called with each streamed chunk of the modified code.
+
+        Returns:
+            tuple[str, dict]: A tuple containing the validated modified strategy code and its parameters.
 
-        modified_strategy = self.llm_interface.modify_strategy(
-            current_strategy, modification_prompt
+        Raises:
+            ValueError: If the modification prompt is not related to modifying a trading strategy.
+        """
+        modified_strategy = await self.llm_interface.amodify_strategy(
+            current_strategy, modification_prompt, on_token=on_token
+        )
+        description = await self._aclassify_and_describe(
+            modification_prompt,
+            modified_strategy,
+            "The provided prompt is not related to modifying a trading strategy.",
         )
-        validated_code, parameters = self.code_validator.check_and_correct_strategy(
-            modified_strategy
+        validated_code, parameters = await self._avalidate_strategy(modified_strategy)
+        await self._aupdate_strategy_description(
+            validated_code,
+            description if validated_code == modified_strategy else None,
         )
-        self._update_strategy_description(validated_code)
         logger.info("Successfully modified strategy.")
         return validated_code, parameters
 
+    def stream_strategy(
+        self, prompt: str, current_strategy: str = None
+    ) -> Iterator[Union[str, dict]]:
+        """
+        Generates, or modifies if `current_strategy` is given, a strategy while
+        yielding the code as the language model produces it.
+
+        Args:
+            prompt (str): The user's prompt for generating or modifying the strategy.
+            current_strategy (str, optional): The current trading strategy code to modify.
+
+        Yields:
+            str | dict: Chunks of the generated code, then a dict with the validated
+                `strategy_code` and its `parameters`. Validation may correct the code,
+                so the final code can differ from the streamed one.
+
+        Raises:
+            ValueError: If the prompt is not related to trading strategies, or the
+                strategy could not be validated.
+        """
+        tokens = queue.Queue()
+        done = object()
+
+        if current_strategy:
+            coroutine = self.amodify_strategy(
+                current_strategy, prompt, on_token=tokens.put
+            )
+        else:
+            coroutine = self.agenerate_strategy(prompt, on_token=tokens.put)
+        future = self.llm_interface.submit(self._with_description(coroutine))
+        future.add_done_callback(lambda _: tokens.put(done))
+        while (token := tokens.get()) is not done:
+            yield token
+
+        (strategy_code, parameters), self.current_strategy_description = (
+            future.result()
+        )
+        yield {"strategy_code": strategy_code, "parameters": parameters}
+
+    def _run(self, coroutine):
+        """
+        Runs a generation or modification on the LLM interface's event loop,
+        carrying the description it sets back to the calling thread.
+
+        Args:
+            coroutine: The coroutine generating or modifying the strategy.
+
+        Returns:
+            tuple[str, dict]: The result of the coroutine.
+        """
+        result, self.current_strategy_description = self.llm_interface.run(
+            self._with_description(coroutine)
+        )
+        return result
+
+    async def _with_description(self, coroutine):
+        """
+        Awaits a generation or modification along with the description it sets,
+        which would otherwise stay in the context of the event loop's task.
+
+        Args:
+            coroutine: The coroutine generating or modifying the strategy.
+
+        Returns:
+            tuple: The result of the coroutine and the strategy description.
+        """
+        result = await coroutine
+        return result, self.current_strategy_description
+
+    async def _aclassify_and_describe(
+        self, prompt: str, strategy_code: str, irrelevant_message: str
+    ) -> str:
+        """
+        Checks the relevance of a prompt and describes the strategy generated from it.
+
+        Args:
+            prompt (str): The user's prompt.
+            strategy_code (str): The strategy code generated from the prompt.
+            irrelevant_message (str): The error message if the prompt is not relevant.
+
+        Returns:
+            str: The description of the strategy.
+
+        Raises:
+            ValueError: If the prompt is not related to trading strategies.
+        """
+        is_relevant, description = await self.llm_interface.aclassify_and_describe(
+            prompt, strategy_code
+        )
+        if not is_relevant:
+            logger.error(irrelevant_message)
+            raise ValueError(irrelevant_message)
+        return description
+
+    async def _avalidate_strategy(self, strategy_code: str) -> tuple[str, dict]:
+        """
+        Validates and corrects strategy code, reusing the result of an
+        earlier validation of the same code.
+
+        Args:
+            strategy_code (str): The strategy code to validate.
+
+        Returns:
+            tuple[str, dict]: A tuple containing the validated strategy code and its parameters.
+
+        Raises:
+            ValueError: If the strategy could not be validated.
+        """
+        key = hashlib.blake2b(strategy_code.encode(), digest_size=16).hexdigest()
+        with self._validation_cache_lock:
+            cached = self._validation_cache.get(key)
+            if cached is not None:
+                self._validation_cache.move_to_end(key)
+        if cached is not None:
+            logger.info("Using cached validation result.")
+            validated_code, parameters = cached
+            return validated_code, dict(parameters)
+
+        validated_code, parameters = (
+            await self.code_validator.acheck_and_correct_strategy(strategy_code)
+        )
+        with self._validation_cache_lock:
+            self._validation_cache[key] = (validated_code, dict(parameters))
+            if len(self._validation_cache) > self.VALIDATION_CACHE_SIZE:
+                self._validation_cache.popitem(last=False)
+        return validated_code, parameters
+
     def _update_strategy_description(self, strategy_code: str):
         """
         Updates the current strategy description based on the given strategy code.
@@ -114,6 +312,22 @@ class StrategyGenerator:
         logger.info("Updated Strategy Description:")
         logger.info(self.current_strategy_description)
 
+    async def _aupdate_strategy_description(
+        self, strategy_code: str, description: str = None
+    ):
+        """
+        Asynchronous version of `_update_strategy_description`.
+
+        Args:
+            strategy_code (str): The code of the strategy to describe.
+            description (str, optional): An already generated description of the strategy code.
+        """
+        if description is None:
+            description = await self.llm_interface.adescribe_strategy(strategy_code)
+        self.current_strategy_description = description
+        logger.info("Updated Strategy Description:")
+        logger.info(self.current_strategy_description)
+
     def get_current_strategy_description(self) -> str:
         """
         Retrieves the current strategy description.
@@ -0,0 +1,168 @@
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Strategy code opts into the vectorized path by setting `__vectorized__ = True`
+# and defining this function instead of a Backtrader strategy class:
+#
+#     def generate_positions(open_, high, low, close, volume, **params):
+#         ...  # one position per bar, as a NumPy array
+#
+# The strategy generator only produces Backtrader strategies, so vectorized code
+# is written by hand and submitted as the strategy_code of a backtest run.
+SIGNAL_FUNCTION_NAME = "generate_positions"
+
+# Same defaults as Backtrader's SharpeRatio analyzer
+RISK_FREE_RATE = 0.01
+
+
+def run_vectorized_backtest(signal_function, df, parameters, initial_cash):
+    """
+    Runs a vectorized backtest over OHLCV data without Backtrader's per-bar event loop.
+
+    Positions are expressed in units of the asset (matching Backtrader's default
+    stake of 1) and are held from the close of a bar to the close of the next one.
+
+    Args:
+        signal_function (callable): The signal function of the strategy.
+        df (pd.DataFrame): The OHLCV data, indexed by datetime.
+        parameters (dict): Parameters for the strategy.
+        initial_cash (float): The initial cash for the backtest portfolio.
+
+    Returns:
+        dict: Metrics in the same shape as `Metrics.calculate` returns for a single result.
+    """
+    columns = df.rename(columns=str.lower)
+    open_, high, low, close, volume = (
+        columns[["open", "high", "low", "close", "volume"]].to_numpy(np.float64).T
+    )
+    positions = np.asarray(
+        signal_function(open_, high, low, close, volume, **parameters),
+        dtype=np.float64,
+    )
+    if positions.shape != close.shape:
+        raise ValueError(
+            f"{SIGNAL_FUNCTION_NAME} must return one position per bar, "
+            f"got {positions.shape} for {close.shape} bars."
+        )
+
+    held = positions[:-1]
+    pnl = held * np.diff(close)
+    equity = initial_cash + np.concatenate(([0.0], np.cumsum(pnl)))
+    portfolio_value = float(equity[-1]) if len(equity) else float(initial_cash)
+
+    metrics = {
+        "final_portfolio_value": portfolio_value,
+        "sharpe_ratio": _sharpe_ratio(equity, df.index, initial_cash),
+        "max_drawdown": _max_drawdown(equity),
+        "total_return": (
+            math.log(portfolio_value / initial_cash)
+            if portfolio_value > 0 and initial_cash > 0
+            else None
+        ),
+        "trade_analysis": _trade_analysis(held, pnl),
+    }
+    logger.info(f"Vectorized backtest final portfolio value: {portfolio_value}")
+    return metrics
+
+
+def _sharpe_ratio(equity, index, initial_cash):
+    """
+    Calculates the Sharpe ratio over yearly returns, like Backtrader's SharpeRatio analyzer.
+
+    Args:
+        equity (np.ndarray): The portfolio value at the close of each bar.
+        index (pd.DatetimeIndex): The datetime of each bar.
+        initial_cash (float): The initial cash for the backtest portfolio.
+
+    Returns:
+        float: The Sharpe ratio, or None if it cannot be calculated.
+    """
+    if len(equity) == 0:
+        return None
+    years = index.year.to_numpy()
+    year_ends = np.flatnonzero(np.diff(years) != 0).tolist() + [len(years) - 1]
+    values = np.concatenate(([initial_cash], equity[year_ends]))
+    excess_returns = values[1:] / values[:-1] - 1.0 - RISK_FREE_RATE
+    std = excess_returns.std()
+    if std == 0 or not np.isfinite(std):
+        return None
+    return float(excess_returns.mean() / std)
+
+
+def _max_drawdown(equity):
+    """
+    Calculates the maximum drawdown of the portfolio in percent.
+
+    Args:
+        equity (np.ndarray): The portfolio value at the close of each bar.
+
+    Returns:
+        float: The maximum drawdown in percent.
+    """
+    if len(equity) == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(equity)
+    return float(np.max((peaks - equity) / peaks) * 100)
+
+
+def _trade_analysis(held, pnl):
+    """
+    Derives trade statistics from the held positions, treating each run of an
+    unchanged non-zero position as one trade.
+
+    Args:
+        held (np.ndarray): The position held over each bar.
+        pnl (np.ndarray): The profit and loss of each bar.
+
+    Returns:
+        dict: Trade analysis metrics with the same keys as `Metrics._process_trade_analysis`.
+    """
+    if len(held) == 0:
+        trade_pnls = trade_lengths = np.array([])
+    else:
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(held) != 0) + 1))
+        in_market = held[starts] != 0
+        trade_pnls = np.add.reduceat(pnl, starts)[in_market]
+        trade_lengths = np.diff(np.append(starts, len(held)))[in_market]
+
+    total_trades = len(trade_pnls)
+    if total_trades == 0:
+        logger.info("No trades to analyze.")
+        return {
+            "total_trades": 0,
+            "winning_trades": 0,
+            "losing_trades": 0,
+            "win_rate": 0,
+            "avg_trade": 0,
+            "avg_win": 0,
+            "avg_loss": 0,
+            "largest_win": 0,
+            "largest_loss": 0,
+            "avg_trade_length": 0,
+            "profit_factor": 0,
+        }
+
+    wins = trade_pnls[trade_pnls > 0]
+    losses = trade_pnls[trade_pnls <= 0]
+    gross_profits = float(wins.sum())
+    gross_losses = float(abs(losses.sum()))
+
+    return {
+        "total_trades": total_trades,
+        "winning_trades": len(wins),
+        "losing_trades": len(losses),
+        "win_rate": len(wins) / total_trades * 100,
+        "avg_trade": float(trade_pnls.mean()),
+        "avg_win": float(wins.mean()) if len(wins) else 0,
+        "avg_loss": float(losses.mean()) if len(losses) else 0,
+        "largest_win": float(wins.max()) if len(wins) else 0,
+        "largest_loss": float(losses.min()) if len(losses) else 0,
+        "avg_trade_length": float(trade_lengths.mean()),
+        "profit_factor": (
+            gross_profits / gross_losses if gross_losses != 0 else float("inf")
+        ),
+    }
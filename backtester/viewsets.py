@@ -1,67 +1,126 @@
+import hashlib
+import json
 import logging
+import re
+
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from backtester.models import Strategy
+from backtester.models import BacktestJob, Strategy
 from backtester.serializers import (
+    BacktestJobSerializer,
+    RunBacktestSerializer,
     CreateStrategySerializer,
     ListStrategySerializer,
+    StrategyStatusSerializer,
     UpdateStrategySerializer,
 )
-from backtester.utils.backtester import Backtester
-from backtester.utils.strategy_generator import StrategyGenerator
+from backtester.tasks import (
+    enqueue_backtest,
+    enqueue_strategy_generation,
+    error_message,
+    get_cached_backtest,
+    get_cached_strategy,
+    stream_strategy,
+)
 
 logger = logging.getLogger(__name__)
 
+# Separates the assets of a comma-separated list, along with surrounding whitespace
+_ASSET_SPLIT_RE = re.compile(r"\s*,\s*")
+
+
+def _strategy_etag(request, pk=None, *args, **kwargs):
+    """
+    ETag of a single strategy, which changes whenever the strategy is saved.
+    """
+    try:
+        updated_at = (
+            Strategy.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+        )
+    except (TypeError, ValueError):
+        # Leave malformed pks to get_object(), which answers them with a 404.
+        return None
+    return updated_at.isoformat() if updated_at else None
+
+
+def _strategy_list_etag(request, *args, **kwargs):
+    """
+    ETag of a page of the strategy list, which changes whenever a strategy is
+    added, saved or deleted.
+    """
+    summary = Strategy.objects.aggregate(
+        count=Count("pk"), updated_at=Max("updated_at")
+    )
+    tag = f"{summary['count']}:{summary['updated_at']}:{request.GET.urlencode()}"
+    return hashlib.sha256(tag.encode()).hexdigest()
+
 
+@method_decorator(condition(etag_func=_strategy_list_etag), name="list")
+@method_decorator(condition(etag_func=_strategy_etag), name="retrieve")
 class StrategyViewSet(viewsets.ModelViewSet):
     """
     ViewSet for creating and modifying trading strategies.
+
+    Strategies are generated in the background: create and partial_update
+    return 202 with a pending strategy, whose progress is polled through the
+    status action. Prompts with a cached strategy are answered immediately.
+
+    Generations run in this process only, so a restart loses the ones in flight.
+    Their strategies are marked as failed at startup by the fail_interrupted_jobs
+    command, or by a later background job once they have been running for
+    STRATEGY_GENERATION_TIMEOUT, and clients should then submit them again.
+
+    Reads carry an ETag, so polling clients get a 304 while nothing changed.
     """
 
-    queryset = Strategy.objects.all()
+    # Only a placeholder for introspection, get_queryset builds the real queryset
+    queryset = Strategy.objects.none()
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.strategy_generator = StrategyGenerator()
+    # PUT and DELETE are rejected before dispatch, strategies are changed via PATCH
+    http_method_names = ["get", "post", "patch", "head", "options"]
+
+    serializer_classes = {
+        "create": CreateStrategySerializer,
+        "stream": CreateStrategySerializer,
+        "list": ListStrategySerializer,
+        "retrieve": ListStrategySerializer,
+        "partial_update": UpdateStrategySerializer,
+        "status": StrategyStatusSerializer,
+    }
+
+    # Columns rendered by ListStrategySerializer, the only ones a list needs to load
+    list_fields = tuple(
+        field.source for field in ListStrategySerializer().fields.values()
+    )
+
+    def get_queryset(self):
+        """
+        Strategies have no relations to eager-load, so a list only narrows
+        the loaded columns to those rendered by ListStrategySerializer.
+        """
+        queryset = Strategy.objects.all()
+        if self.action == "list":
+            queryset = queryset.only(*self.list_fields)
+        return queryset
 
     def get_serializer_class(self):
-        if self.action == "create":
-            return CreateStrategySerializer
-        elif self.action == "list":
-            return ListStrategySerializer
-        elif self.action == "partial_update":
-            return UpdateStrategySerializer
-
-    def handle_strategy_generation(self, prompt, strategy_code=None):
-        """
-        Generate or modify a strategy based on prompt and strategy_code.
-        """
-        try:
-            if strategy_code:
-                # Modify strategy
-                strategy_code, parameters = self.strategy_generator.modify_strategy(
-                    strategy_code, prompt
-                )
-            else:
-                # Generate new strategy
-                strategy_code, parameters = self.strategy_generator.generate_strategy(
-                    prompt
-                )
-
-            logger.info(
-                f"Strategy processed successfully with parameters: {parameters}"
-            )
-            return strategy_code, parameters
-        except ValueError as e:
-            logger.error(f"Error generating strategy: {e}")
-            raise
+        return self.serializer_classes.get(self.action, ListStrategySerializer)
 
     def create(self, request):
         """
         Create a new trading strategy based on user input.
+        A list of strategies can be posted to create them in bulk.
         """
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+
         create_serializer = self.get_serializer(data=request.data)
         create_serializer.is_valid(raise_exception=True)
 
@@ -69,23 +128,47 @@ class StrategyViewSet(viewsets.ModelViewSet):
         data = create_serializer.validated_data
         prompt = data["prompt"]
 
-        try:
-            strategy_code, parameters = self.handle_strategy_generation(prompt)
+        cached = get_cached_strategy(prompt)
+        if cached is not None:
+            strategy_code, parameters = cached
             created_strategy = create_serializer.save(
                 strategy_code=strategy_code, parameters=parameters
             )
-
             return Response(
                 ListStrategySerializer(created_strategy).data,
                 status=status.HTTP_201_CREATED,
             )
-        except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+
+        created_strategy = create_serializer.save(
+            strategy_code="", parameters={}, status=Strategy.Status.PENDING
+        )
+        enqueue_strategy_generation(created_strategy.id, prompt)
+
+        return Response(
+            ListStrategySerializer(created_strategy).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    def bulk_create(self, request):
+        """
+        Create several trading strategies, inserting them in a single transaction
+        and generating their code in the background.
+        """
+        create_serializer = self.get_serializer(data=request.data, many=True)
+        create_serializer.is_valid(raise_exception=True)
+
+        for data in create_serializer.validated_data:
+            data["strategy_code"], data["parameters"] = "", {}
+            data["status"] = Strategy.Status.PENDING
+        created_strategies = create_serializer.save()
+
+        for created_strategy in created_strategies:
+            enqueue_strategy_generation(created_strategy.id, created_strategy.prompt)
+
+        return Response(
+            ListStrategySerializer(created_strategies, many=True).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
 
     def partial_update(self, request, pk=None):
         """
@@ -102,75 +185,124 @@ class StrategyViewSet(viewsets.ModelViewSet):
         strategy_code = data.get("strategy_code", strategy.strategy_code)
         prompt = data.get("prompt", strategy.prompt)
 
-        try:
-            strategy_code, parameters = self.handle_strategy_generation(
-                prompt, strategy_code
-            )
-
-            # Save the update serializer with new values
-            updates_strategy = update_serializer.save(
-                strategy_code=strategy_code, parameters=parameters
+        cached = get_cached_strategy(prompt, strategy_code)
+        if cached is not None:
+            strategy_code, parameters = cached
+            updated_strategy = update_serializer.save(
+                strategy_code=strategy_code,
+                parameters=parameters,
+                status=Strategy.Status.READY,
+                error="",
             )
-
             return Response(
-                ListStrategySerializer(updates_strategy).data,
+                ListStrategySerializer(updated_strategy).data,
                 status=status.HTTP_200_OK,
             )
-        except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+
+        updated_strategy = update_serializer.save(
+            status=Strategy.Status.PENDING, error="", started_at=None
+        )
+        enqueue_strategy_generation(updated_strategy.id, prompt, strategy_code)
+
+        return Response(
+            ListStrategySerializer(updated_strategy).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=False, methods=["post"])
+    def stream(self, request):
+        """
+        Create a new trading strategy, streaming its code while it is generated.
+
+        The response is newline-delimited JSON: {"token": ...} events with chunks
+        of the generated code, then either {"strategy": ...} with the saved
+        strategy or {"error": ...}. The strategy is only saved once its code
+        has been generated and validated.
+        """
+        create_serializer = self.get_serializer(data=request.data)
+        create_serializer.is_valid(raise_exception=True)
+        prompt = create_serializer.validated_data["prompt"]
+
+        def events():
+            try:
+                for chunk in stream_strategy(prompt):
+                    if isinstance(chunk, dict):
+                        created_strategy = create_serializer.save(**chunk)
+                        event = {
+                            "strategy": ListStrategySerializer(created_strategy).data
+                        }
+                    else:
+                        event = {"token": chunk}
+                    yield json.dumps(event) + "\n"
+            except Exception as e:
+                if isinstance(e, ValueError):
+                    logger.error("Error streaming strategy: %s", error_message(e))
+                else:
+                    logger.exception("Unexpected error streaming strategy")
+                yield json.dumps({"error": error_message(e)}) + "\n"
+
+        return StreamingHttpResponse(events(), content_type="application/x-ndjson")
+
+    @action(detail=True, methods=["get"])
+    @method_decorator(condition(etag_func=_strategy_etag))
+    def status(self, request, pk=None):
+        """
+        Report the generation status of a strategy, with its code once ready.
+        """
+        strategy = self.get_object()
+        return Response(self.get_serializer(strategy).data, status=status.HTTP_200_OK)
 
 
 class BacktestViewSet(viewsets.ViewSet):
     """
     ViewSet for running backtests on trading strategies.
+
+    Backtests run in the background: run returns 202 with a job id, whose
+    status and results are polled through retrieve. Backtests that were run
+    before without plots are answered immediately from the cache.
+
+    Jobs run in this process only, so a restart loses the ones in flight. They
+    are marked as failed at startup by the fail_interrupted_jobs command, or by
+    a later background job once they have been running for BACKTEST_STALE_TIMEOUT.
     """
 
+    lookup_value_regex = "[0-9a-f-]{36}"
+
     @action(detail=False, methods=["post"], url_path="run")
     def run(self, request):
         """
-        Run a backtest on a given strategy.
+        Queue a backtest on a given strategy.
         """
-        strategy_code = request.data.get("strategy_code")
-        if not strategy_code:
-            return Response(
-                {"error": "No strategy to backtest. Please provide a strategy."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        run_serializer = RunBacktestSerializer(data=request.data)
+        run_serializer.is_valid(raise_exception=True)
+        # The representation keeps dates as the YYYY-MM-DD strings Backtester parses
+        backtest_parameters = dict(run_serializer.data)
 
-        parameters = request.data.get("parameters", {})
-        assets = request.data.get("assets", [])
-        start_date = request.data.get("start_date", "2022-01-01")
-        end_date = request.data.get("end_date", "2023-01-01")
-        initial_cash = request.data.get("initial_cash", 100000)
-        generate_plots = request.data.get("generate_plots", True)
+        # Plots are only produced by actually running the backtest
+        if not backtest_parameters["generate_plots"]:
+            cached_results = get_cached_backtest(backtest_parameters)
+            if cached_results is not None:
+                logger.info("Using cached backtest results.")
+                return Response({"results": cached_results}, status=status.HTTP_200_OK)
 
-        logger.info(f"Running backtest for strategy: {strategy_code}")
+        logger.info(
+            "Queueing backtest on %d asset(s)", len(backtest_parameters["assets"])
+        )
+        logger.debug(
+            "Backtested strategy code: %s", backtest_parameters["strategy_code"]
+        )
 
-        try:
-            backtester = Backtester(
-                strategy_code=strategy_code,
-                parameters=parameters,
-                data_directory="utils/data",
-                assets=assets,
-                start_date=start_date,
-                end_date=end_date,
-                initial_cash=initial_cash,
-                generate_plots=generate_plots,
-            )
-            results = backtester.run_backtest()
-            logger.info(f"Backtest completed successfully with results: {results}")
+        job = BacktestJob.objects.create(parameters=backtest_parameters)
+        enqueue_backtest(job.pk)
 
-            return Response({"results": results}, status=status.HTTP_200_OK)
-        except Exception as e:
-            logger.error(f"Error running backtest: {e}")
-            return Response(
-                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return Response({"job_id": str(job.pk)}, status=status.HTTP_202_ACCEPTED)
+
+    def retrieve(self, request, pk=None):
+        """
+        Report the status of a backtest job, with its results once ready.
+        """
+        job = get_object_or_404(BacktestJob, pk=pk)
+        return Response(BacktestJobSerializer(job).data, status=status.HTTP_200_OK)
 
 
 class AssetsViewSet(viewsets.ViewSet):
@@ -189,8 +321,8 @@ class AssetsViewSet(viewsets.ViewSet):
                 {"error": "No assets provided."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        assets = [asset.strip() for asset in new_assets.split(",")]
-        logger.info(f"Assets changed to: {assets}")
+        assets = [asset for asset in _ASSET_SPLIT_RE.split(new_assets.strip()) if asset]
+        logger.info("Assets changed to: %s", assets)
 
         return Response(
             {"message": "Assets updated successfully!", "assets": assets},
@@ -151,7 +151,7 @@ LOGGING = {
     },
     "root": {
         "handlers": ["console"],
-        "level": "DEBUG",
+        "level": config("LOG_LEVEL", default="INFO"),
     },
 }
 
@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-15 10:05
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def resolve_duplicate_emails(apps, schema_editor):
+    """
+    Prepare users for the unique email constraint.
+
+    Blank emails were allowed before, so they get a unique placeholder on the
+    reserved .invalid domain. Users sharing a real email can't be resolved
+    automatically, the migration stops and lists them instead.
+    """
+    User = apps.get_model("user_auth", "User")
+
+    for user in User.objects.filter(email=""):
+        user.email = f"user-{user.pk}@users.invalid"
+        user.save(update_fields=["email"])
+
+    duplicates = (
+        User.objects.values("email")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values_list("email", flat=True)
+    )
+    if duplicates:
+        users = User.objects.filter(email__in=list(duplicates)).order_by("email", "pk")
+        listing = ", ".join(f"{user.username} <{user.email}>" for user in users)
+        raise RuntimeError(
+            "Cannot make user emails unique, these users share an email: "
+            f"{listing}. Give them distinct emails and run migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(resolve_duplicate_emails, migrations.RunPython.noop),
+    ]
@@ -8,7 +8,12 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["username", "email", "password", "first_name", "last_name"]
-        extra_kwargs = {"password": {"write_only": True}}
+        # Uniqueness is enforced by the database on insert, not by extra queries
+        extra_kwargs = {
+            "password": {"write_only": True},
+            "username": {"validators": [User.username_validator]},
+            "email": {"validators": []},
+        }
 
     def create(self, validated_data):
         user = User.objects.create_user(
@@ -1,6 +1,7 @@
 from rest_framework import viewsets
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from .serializers import UserSerializer
@@ -9,38 +10,28 @@ User = get_user_model()
 
 
 class UserViewSet(viewsets.ViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.none()
     serializer_class = UserSerializer
     permission_classes = (AllowAny,)
 
     def create(self, request):
         serializer = UserSerializer(data=request.data)
-        if serializer.is_valid():
-            username = serializer.validated_data["username"]
-            email = serializer.validated_data["email"]
-
-            if User.objects.filter(username=username).exists():
-                return Response(
-                    {"error": "Username already exists"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            if User.objects.filter(email=email).exists():
-                return Response(
-                    {"error": "Email already exists"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                password=serializer.validated_data["password"],
-                first_name=serializer.validated_data["first_name"],
-                last_name=serializer.validated_data["last_name"],
-            )
-
-            serializer = UserSerializer(user)
-            response_data = {"status": "User created", "data": serializer.data}
-            return Response(response_data, status=status.HTTP_201_CREATED)
-        else:
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                # UserSerializer.create hashes the password through create_user
+                serializer.save()
+        except IntegrityError:
+            # Only a failed insert pays for finding out which value was taken
+            if User.objects.filter(
+                username=serializer.validated_data["username"]
+            ).exists():
+                error = "Username already exists"
+            elif User.objects.filter(email=serializer.validated_data["email"]).exists():
+                error = "Email already exists"
+            else:
+                raise
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        response_data = {"status": "User created", "data": serializer.data}
+        return Response(response_data, status=status.HTTP_201_CREATED)